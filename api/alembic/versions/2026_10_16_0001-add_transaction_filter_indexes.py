@@ -0,0 +1,31 @@
+"""Add composite indexes for transaction filters
+
+Revision ID: add_transaction_filter_indexes
+Revises: add_local_auth_fields
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_transaction_filter_indexes'
+down_revision: Union[str, None] = 'add_local_auth_fields'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add (user_id, transaction_date) and (user_id, amount) indexes."""
+    # Back the per-user date range and amount range filters in get_transactions
+    op.create_index('idx_transactions_user_date', 'transactions', ['user_id', 'transaction_date'])
+    op.create_index('idx_transactions_user_amount', 'transactions', ['user_id', 'amount'])
+
+
+def downgrade() -> None:
+    """Drop the transaction filter indexes."""
+    op.drop_index('idx_transactions_user_amount', 'transactions')
+    op.drop_index('idx_transactions_user_date', 'transactions')
@@ -33,6 +33,8 @@ CREATE TABLE IF NOT EXISTS transactions (
 CREATE INDEX idx_transactions_user_id ON transactions(user_id);
 CREATE INDEX idx_transactions_date ON transactions(transaction_date);
 CREATE INDEX idx_transactions_account_id ON transactions(account_id);
+CREATE INDEX idx_transactions_user_date ON transactions(user_id, transaction_date);
+CREATE INDEX idx_transactions_user_amount ON transactions(user_id, amount);
 
 -- Create import_history table
 CREATE TABLE IF NOT EXISTS import_history (
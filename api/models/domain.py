@@ -1,7 +1,7 @@
 """
 Domain models for database entities.
 """
-from sqlalchemy import Column, String, DateTime, Boolean, Date, Numeric, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, Date, Numeric, Text, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 import uuid
@@ -40,6 +40,12 @@ class Transaction(Base):
     source = Column(String, nullable=False)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Composite indexes for the per-user date and amount range filters
+        Index("idx_transactions_user_date", "user_id", "transaction_date"),
+        Index("idx_transactions_user_amount", "user_id", "amount"),
+    )
 
 
 class ImportHistory(Base):
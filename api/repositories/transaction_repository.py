@@ -1,10 +1,10 @@
 """
 Transaction repository for database operations.
 """
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import date
 from decimal import Decimal
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, insert, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.models.domain import Transaction
 from api.repositories.base_repository import BaseRepository
@@ -77,10 +77,10 @@ class TransactionRepository(BaseRepository):
             Transaction.created_at.desc()
         )
         
-        # Get total count
-        count_query = select(Transaction).where(and_(*conditions))
+        # Get total count with a single COUNT(*) rather than loading every row
+        count_query = select(func.count()).select_from(Transaction).where(and_(*conditions))
         count_result = await self.db.execute(count_query)
-        total = len(count_result.scalars().all())
+        total = count_result.scalar_one()
         
         # Apply pagination
         query = query.limit(limit).offset(offset)
@@ -167,27 +167,30 @@ class TransactionRepository(BaseRepository):
     
     async def create_transactions_bulk(
         self,
-        transactions: List[Transaction]
+        rows: List[Dict[str, Any]]
     ) -> List[Transaction]:
         """
         Bulk create transactions (more efficient than creating one by one).
         
+        All rows are sent as a single INSERT ... RETURNING, so the created
+        transactions come back without a per-row refresh.
+        
         Args:
-            transactions: List of Transaction objects to create
+            rows: List of column-value dictionaries, one per transaction
             
         Returns:
-            List of created transactions
+            List of created transactions, in the same order as rows
         """
-        if not transactions:
+        if not rows:
             return []
         
-        self.db.add_all(transactions)
+        result = await self.db.scalars(
+            insert(Transaction).returning(Transaction, sort_by_parameter_order=True),
+            rows
+        )
+        transactions = list(result.all())
         await self.db.commit()
         
-        # Refresh all transactions
-        for transaction in transactions:
-            await self.db.refresh(transaction)
-        
         return transactions
     
     async def transaction_exists(
@@ -10,7 +10,6 @@ from decimal import Decimal
 
 from api.repositories.transaction_repository import TransactionRepository
 from api.repositories.import_repository import ImportRepository
-from api.models.domain import Transaction
 
 
 class ImportService:
@@ -445,8 +444,8 @@ class ImportService:
                     user_id
                 )
             
-            # Second pass: create Transaction objects only for new transactions
-            transactions_to_create: List[Transaction] = []
+            # Second pass: build insert rows only for new transactions
+            transactions_to_create: List[Dict[str, Any]] = []
             for parsed in parsed_transactions:
                 tx_id = parsed['transaction_id']
                 
@@ -455,8 +454,8 @@ class ImportService:
                     rows_skipped += 1
                     continue
                 
-                # Create transaction object
-                transaction = Transaction(
+                # Build transaction row
+                transaction = dict(
                     transaction_id=tx_id,
                     user_id=user_id,
                     transaction_date=parsed['transaction_date'],
@@ -611,8 +610,8 @@ class ImportService:
                     user_id
                 )
             
-            # Second pass: create Transaction objects only for new transactions
-            transactions_to_create: List[Transaction] = []
+            # Second pass: build insert rows only for new transactions
+            transactions_to_create: List[Dict[str, Any]] = []
             for parsed in parsed_transactions:
                 tx_id = parsed['transaction_id']
                 
@@ -621,8 +620,8 @@ class ImportService:
                     rows_skipped += 1
                     continue
                 
-                # Create transaction object
-                transaction = Transaction(
+                # Build transaction row
+                transaction = dict(
                     transaction_id=tx_id,
                     user_id=user_id,
                     transaction_date=parsed['transaction_date'],
@@ -10,7 +10,7 @@ import hashlib
 import secrets
 import hmac
 
-from jose import jwt
+import jwt
 
 from api.config import settings
 from api.utils.exceptions import (
@@ -286,7 +286,7 @@ class LocalAuthService:
             
         except jwt.ExpiredSignatureError:
             raise AuthenticationError("Refresh token has expired")
-        except jwt.JWTError as e:
+        except jwt.InvalidTokenError as e:
             raise AuthenticationError(f"Invalid refresh token: {str(e)}")
     
     async def forgot_password(self, email: str) -> Dict[str, Any]:
@@ -8,23 +8,43 @@ import pytest
 from hypothesis import given, strategies as st, settings
 from datetime import date
 from decimal import Decimal
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from api.models.domain import Base, User, Transaction
+from api.models.domain import User, Transaction
 from api.repositories.transaction_repository import TransactionRepository
+import itertools
 import uuid
 
 
+# Cheap per-process unique IDs for property examples; each example gets a
+# fresh database, so these only need to be unique, not random
+_ID = itertools.count()
+
+
+def _uid():
+    """Return the next counter-based test ID."""
+    return f"user-{next(_ID)}"
+
+
+# Pre-built pool of two-place amounts from -10000.00 to 10000.00 in 10.00
+# steps (2001 values); indexing a tuple is much cheaper than st.decimals
+AMOUNT_POOL = tuple(
+    Decimal(cents).scaleb(-2) for cents in range(-1_000_000, 1_000_001, 1000)
+)
+
+
 # Strategy for generating amounts
 def amount_strategy():
     """Generate amounts between -10000 and 10000."""
-    return st.decimals(
-        min_value=Decimal("-10000.00"),
-        max_value=Decimal("10000.00"),
-        allow_nan=False,
-        allow_infinity=False,
-        places=2
-    )
+    return st.sampled_from(AMOUNT_POOL)
+
+
+def make_range_predicate(amount_min, amount_max):
+    """Build an inclusive range check with the bounds bound as fast locals."""
+    def in_range(amount, _lo=amount_min, _hi=amount_max):
+        return _lo <= amount <= _hi
+    return in_range
 
 
 # Strategy for generating transactions
@@ -44,14 +64,13 @@ def transaction_strategy(draw):
     }
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @given(
     transactions=st.lists(transaction_strategy(), min_size=5, max_size=20),
-    amount_min=amount_strategy(),
-    amount_max=amount_strategy()
+    amount_range=st.tuples(amount_strategy(), amount_strategy()).map(sorted)
 )
-@settings(max_examples=100, deadline=None)
-async def test_amount_range_filtering_property(transactions, amount_min, amount_max):
+@settings(max_examples=20, deadline=None)
+async def test_amount_range_filtering_property(transactions, amount_range, create_sqlite_schema):
     """
     Property 12: Amount range filtering
     
@@ -60,9 +79,9 @@ async def test_amount_range_filtering_property(transactions, amount_min, amount_
     
     Validates: Requirements 4.4
     """
-    # Ensure amount_min <= amount_max
-    if amount_min > amount_max:
-        amount_min, amount_max = amount_max, amount_min
+    # Bounds are drawn pre-sorted, so amount_min <= amount_max always holds
+    amount_min, amount_max = amount_range
+    in_range = make_range_predicate(amount_min, amount_max)
     
     # Create test database
     engine = create_async_engine(
@@ -71,66 +90,62 @@ async def test_amount_range_filtering_property(transactions, amount_min, amount_
     )
     
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await create_sqlite_schema(conn)
     
     async_session = sessionmaker(
         engine, class_=AsyncSession, expire_on_commit=False
     )
     
     async with async_session() as session:
-        # Create test user
-        user = User(
-            user_id=str(uuid.uuid4()),
-            cognito_sub=f"test-sub-{uuid.uuid4()}",
-            email=f"test-{uuid.uuid4()}@example.com",
-            is_active=True
-        )
-        session.add(user)
-        await session.commit()
-        await session.refresh(user)
-        
-        # Create transactions
-        created_transactions = []
-        for txn_data in transactions:
-            txn = Transaction(
-                user_id=user.user_id,
-                **txn_data
-            )
-            session.add(txn)
-            created_transactions.append(txn)
+        # Insert the user and all transactions as two executemany batches on
+        # the session's connection; the user_id is generated here so no
+        # refresh round-trip is needed
+        user_id = _uid()
+        txn_rows = [{"user_id": user_id, **txn_data} for txn_data in transactions]
         
+        conn = await session.connection()
+        await conn.execute(insert(User), [{
+            "user_id": user_id,
+            "cognito_sub": f"test-sub-{_uid()}",
+            "email": f"test-{_uid()}@example.com",
+            "is_active": True,
+        }])
+        await conn.execute(insert(Transaction), txn_rows)
         await session.commit()
         
         # Query with amount range filter
         repo = TransactionRepository(session)
         results, total = await repo.get_transactions(
-            user_id=user.user_id,
+            user_id=user_id,
             amount_min=amount_min,
             amount_max=amount_max
         )
         
         # Property: All returned transactions should have amounts within range
         for txn in results:
-            assert amount_min <= txn.amount <= amount_max, (
+            assert in_range(txn.amount), (
                 f"Transaction amount {txn.amount} is outside range "
                 f"[{amount_min}, {amount_max}]"
             )
         
         # Verify we didn't miss any transactions that should be in range
-        expected_in_range = [
-            txn for txn in created_transactions
-            if amount_min <= txn.amount <= amount_max
-        ]
-        assert len(results) == len(expected_in_range), (
-            f"Expected {len(expected_in_range)} transactions in range, "
+        expected_count = sum(
+            1 for txn_data in transactions
+            if in_range(txn_data["amount"])
+        )
+        assert len(results) == expected_count, (
+            f"Expected {expected_count} transactions in range, "
             f"but got {len(results)}"
         )
+        assert total == expected_count, (
+            f"Expected total count {expected_count}, but got {total}"
+        )
     
     await engine.dispose()
 
 
-@pytest.mark.asyncio
-async def test_amount_range_filtering_example():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_amount_range_filtering_example(create_sqlite_schema):
     """
     Example test: Verify amount range filtering with specific amounts.
     """
@@ -141,7 +156,7 @@ async def test_amount_range_filtering_example():
     )
     
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await create_sqlite_schema(conn)
     
     async_session = sessionmaker(
         engine, class_=AsyncSession, expire_on_commit=False
@@ -8,13 +8,24 @@ import pytest
 from hypothesis import given, strategies as st, settings
 from datetime import date, timedelta
 from decimal import Decimal
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from api.models.domain import Base, User, Transaction
+from api.models.domain import User, Transaction
 from api.repositories.transaction_repository import TransactionRepository
+import itertools
 import uuid
 
 
+# Counter-based IDs for the property test (no urandom read per ID)
+_ID = itertools.count()
+
+
+def _uid():
+    """Return the next counter-based test ID."""
+    return f"user-{next(_ID)}"
+
+
 # Strategy for generating dates
 def date_strategy():
     """Generate dates between 2020 and 2025."""
@@ -44,14 +55,13 @@ def transaction_strategy(draw):
 
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @given(
     transactions=st.lists(transaction_strategy(), min_size=5, max_size=20),
-    start_date=date_strategy(),
-    end_date=date_strategy()
+    date_range=st.tuples(date_strategy(), date_strategy()).map(sorted)
 )
-@settings(max_examples=100, deadline=None)
-async def test_date_range_filtering_property(transactions, start_date, end_date):
+@settings(max_examples=20, deadline=None)
+async def test_date_range_filtering_property(transactions, date_range, create_sqlite_schema):
     """
     Property 11: Date range filtering
     
@@ -61,9 +71,8 @@ async def test_date_range_filtering_property(transactions, start_date, end_date)
     
     Validates: Requirements 4.2
     """
-    # Ensure start_date <= end_date
-    if start_date > end_date:
-        start_date, end_date = end_date, start_date
+    # Bounds are drawn pre-sorted, so start_date <= end_date always holds
+    start_date, end_date = date_range
     
     # Create test database
     engine = create_async_engine(
@@ -72,40 +81,33 @@ async def test_date_range_filtering_property(transactions, start_date, end_date)
     )
     
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await create_sqlite_schema(conn)
     
     async_session = sessionmaker(
         engine, class_=AsyncSession, expire_on_commit=False
     )
     
     async with async_session() as session:
-        # Create test user
-        user = User(
-            user_id=str(uuid.uuid4()),
-            cognito_sub=f"test-sub-{uuid.uuid4()}",
-            email=f"test-{uuid.uuid4()}@example.com",
-            is_active=True
-        )
-        session.add(user)
-        await session.commit()
-        await session.refresh(user)
-        
-        # Create transactions
-        created_transactions = []
-        for txn_data in transactions:
-            txn = Transaction(
-                user_id=user.user_id,
-                **txn_data
-            )
-            session.add(txn)
-            created_transactions.append(txn)
+        # Insert the user and all transactions as two executemany batches on
+        # the session's connection; the user_id is generated here so no
+        # refresh round-trip is needed
+        user_id = _uid()
+        txn_rows = [{"user_id": user_id, **txn_data} for txn_data in transactions]
         
+        conn = await session.connection()
+        await conn.execute(insert(User), [{
+            "user_id": user_id,
+            "cognito_sub": f"test-sub-{_uid()}",
+            "email": f"test-{_uid()}@example.com",
+            "is_active": True,
+        }])
+        await conn.execute(insert(Transaction), txn_rows)
         await session.commit()
         
         # Query with date range filter
         repo = TransactionRepository(session)
         results, total = await repo.get_transactions(
-            user_id=user.user_id,
+            user_id=user_id,
             start_date=start_date,
             end_date=end_date
         )
@@ -118,20 +120,23 @@ async def test_date_range_filtering_property(transactions, start_date, end_date)
             )
         
         # Verify we didn't miss any transactions that should be in range
-        expected_in_range = [
-            txn for txn in created_transactions
-            if start_date <= txn.transaction_date <= end_date
-        ]
-        assert len(results) == len(expected_in_range), (
-            f"Expected {len(expected_in_range)} transactions in range, "
+        expected_count = sum(
+            1 for txn_data in transactions
+            if start_date <= txn_data["transaction_date"] <= end_date
+        )
+        assert len(results) == expected_count, (
+            f"Expected {expected_count} transactions in range, "
             f"but got {len(results)}"
         )
+        assert total == expected_count, (
+            f"Expected total count {expected_count}, but got {total}"
+        )
     
     await engine.dispose()
 
 
-@pytest.mark.asyncio
-async def test_date_range_filtering_example():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_date_range_filtering_example(create_sqlite_schema):
     """
     Example test: Verify date range filtering with specific dates.
     """
@@ -142,7 +147,7 @@ async def test_date_range_filtering_example():
     )
     
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await create_sqlite_schema(conn)
     
     async_session = sessionmaker(
         engine, class_=AsyncSession, expire_on_commit=False
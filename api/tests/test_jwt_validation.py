@@ -4,6 +4,9 @@ Property-based tests for JWT token validation.
 **Feature: api-authentication, Property 2: JWT token validation**
 **Validates: Requirements 7.2, 7.3, 7.5**
 """
+import string
+from types import SimpleNamespace
+
 import pytest
 from hypothesis import given, strategies as st, settings
 
@@ -11,12 +14,25 @@ from api.utils.jwt_utils import decode_jwt_token
 from api.utils.exceptions import AuthenticationError
 
 
+# Letters-only fragment used to assemble fake "header.payload.signature" tokens
+TOKEN_PART = st.text(alphabet=string.ascii_letters, min_size=10, max_size=50)
+
+
+def make_req(headers=None):
+    """Build a minimal request stand-in for calling the auth middleware directly."""
+    return SimpleNamespace(
+        headers=headers or {},
+        url=SimpleNamespace(path='/api/v1/transactions'),
+        state=SimpleNamespace(),
+    )
+
+
 # Property 2: JWT token validation
 # For any API request to a protected endpoint, if the JWT token is invalid or expired,
 # the system should return a 401 Unauthorized error (raise AuthenticationError).
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @given(
     # Generate random malformed tokens
     malformed_token=st.one_of(
@@ -47,12 +63,12 @@ async def test_malformed_token_raises_authentication_error(malformed_token):
         decode_jwt_token(malformed_token)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @given(
     # Generate random strings that look like tokens but aren't
-    token_part1=st.text(min_size=10, max_size=50, alphabet=st.characters(min_codepoint=65, max_codepoint=122)),
-    token_part2=st.text(min_size=10, max_size=50, alphabet=st.characters(min_codepoint=65, max_codepoint=122)),
-    token_part3=st.text(min_size=10, max_size=50, alphabet=st.characters(min_codepoint=65, max_codepoint=122)),
+    token_part1=TOKEN_PART,
+    token_part2=TOKEN_PART,
+    token_part3=TOKEN_PART,
 )
 @settings(max_examples=100)
 async def test_invalid_jwt_structure_raises_error(token_part1, token_part2, token_part3):
@@ -71,7 +87,7 @@ async def test_invalid_jwt_structure_raises_error(token_part1, token_part2, toke
         decode_jwt_token(fake_token)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_empty_token_raises_authentication_error():
     """
     Example test: Verify that empty tokens are rejected.
@@ -83,7 +99,7 @@ async def test_empty_token_raises_authentication_error():
         decode_jwt_token("")
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_token_without_bearer_prefix_in_middleware():
     """
     Example test: Verify that middleware handles requests without Authorization header.
@@ -95,13 +111,7 @@ async def test_token_without_bearer_prefix_in_middleware():
     from api.middleware.auth import jwt_auth_middleware
     
     # Create a mock request without Authorization header
-    class MockRequest:
-        def __init__(self):
-            self.headers = {}
-            self.url = type('obj', (object,), {'path': '/api/v1/transactions'})()
-            self.state = type('obj', (object,), {})()
-    
-    request = MockRequest()
+    request = make_req()
     
     # Mock call_next
     async def mock_call_next(req):
@@ -114,7 +124,7 @@ async def test_token_without_bearer_prefix_in_middleware():
     assert response is not None
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_middleware_rejects_invalid_bearer_format():
     """
     Example test: Verify that middleware rejects tokens without proper Bearer format.
@@ -126,13 +136,7 @@ async def test_middleware_rejects_invalid_bearer_format():
     from api.middleware.auth import jwt_auth_middleware
     
     # Create a mock request with invalid Authorization header
-    class MockRequest:
-        def __init__(self, auth_header):
-            self.headers = {"Authorization": auth_header}
-            self.url = type('obj', (object,), {'path': '/api/v1/transactions'})()
-            self.state = type('obj', (object,), {})()
-    
-    request = MockRequest("InvalidFormat token123")
+    request = make_req({"Authorization": "InvalidFormat token123"})
     
     # Mock call_next
     async def mock_call_next(req):
@@ -143,3 +147,103 @@ async def test_middleware_rejects_invalid_bearer_format():
     
     # Verify response is an error
     assert response.status_code == 401
+
+
+def _sign_cognito_token(private_key, **claims):
+    """Sign an RS256 token with the claims Cognito puts on its tokens."""
+    import time
+    import jwt
+    from api.utils import jwt_utils
+    
+    now = int(time.time())
+    payload = {
+        "sub": "cognito-user-1",
+        "iss": jwt_utils.COGNITO_ISSUER,
+        "iat": now,
+        "exp": now + 3600,
+        **claims,
+    }
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": "test-kid"})
+
+
+@pytest.fixture
+def cognito_key(monkeypatch):
+    """RSA key pair whose public half is served as the Cognito signing key."""
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from api.utils import jwt_utils
+    
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    monkeypatch.setattr(jwt_utils, "get_signing_key", lambda token: private_key.public_key())
+    return private_key
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cognito_access_token_without_aud_decodes(cognito_key, test_settings):
+    """
+    Example test: Cognito access tokens carry client_id and no aud claim,
+    and must still be accepted.
+    """
+    from api.utils.jwt_utils import decode_cognito_token
+    
+    token = _sign_cognito_token(
+        cognito_key, token_use="access", client_id=test_settings.COGNITO_APP_CLIENT_ID
+    )
+    
+    payload = decode_cognito_token(token)
+    
+    assert payload["sub"] == "cognito-user-1"
+    assert "aud" not in payload
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cognito_id_token_checks_aud(cognito_key, test_settings):
+    """Example test: Cognito ID tokens are matched to the app client by aud."""
+    from api.utils.jwt_utils import decode_cognito_token
+    
+    token = _sign_cognito_token(cognito_key, token_use="id", aud=test_settings.COGNITO_APP_CLIENT_ID)
+    assert decode_cognito_token(token)["sub"] == "cognito-user-1"
+    
+    token = _sign_cognito_token(cognito_key, token_use="id", aud="other-client")
+    with pytest.raises(AuthenticationError):
+        decode_cognito_token(token)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("token_use, client_id", [
+    ("access", "other-client"),
+    ("access", None),
+    (None, "app"),
+])
+async def test_cognito_token_for_other_client_rejected(cognito_key, test_settings, token_use, client_id):
+    """Example test: access tokens for another app client, or without token_use, are rejected."""
+    from api.utils.jwt_utils import decode_cognito_token
+    
+    claims = {}
+    if token_use:
+        claims["token_use"] = token_use
+    if client_id:
+        claims["client_id"] = test_settings.COGNITO_APP_CLIENT_ID if client_id == "app" else client_id
+    
+    with pytest.raises(AuthenticationError):
+        decode_cognito_token(_sign_cognito_token(cognito_key, **claims))
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cached_payload_not_shared_between_callers(test_settings):
+    """Example test: changing a decoded payload must not alter what later callers get."""
+    import time
+    import jwt
+    
+    token = jwt.encode(
+        {"sub": "user-1", "exp": int(time.time()) + 3600},
+        test_settings.JWT_SECRET_KEY,
+        algorithm=test_settings.JWT_ALGORITHM,
+    )
+    
+    first = decode_jwt_token(token)
+    first["sub"] = "someone-else"
+    
+    assert decode_jwt_token(token)["sub"] == "user-1"
+    second = decode_jwt_token(token)
+    second["sub"] = "someone-else"
+    assert decode_jwt_token(token)["sub"] == "user-1"
@@ -5,8 +5,10 @@ Property-based tests for user data isolation.
 **Validates: Requirements 9.2**
 """
 import pytest
-from hypothesis import given, strategies as st, settings
+from hypothesis import assume, given, strategies as st, settings
 from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+import itertools
 import uuid
 
 from api.repositories.transaction_repository import TransactionRepository
@@ -16,15 +18,27 @@ from api.repositories.transaction_repository import TransactionRepository
 # For any authenticated user and any transaction query, the returned transactions
 # should only include transactions where the user_id matches the authenticated user's ID.
 
+# Transaction stand-ins and user IDs are built once; each example reassigns user_id
+_TXN_POOL = [
+    SimpleNamespace(
+        user_id=None,
+        transaction_id=str(uuid.uuid4()),
+        description=f"Transaction {i}",
+        amount=100.0,
+    )
+    for i in range(20)
+]
+_OTHER_USER_IDS = itertools.cycle([str(uuid.uuid4()) for _ in range(1000)])
 
-@pytest.mark.asyncio
+
+@pytest.mark.asyncio(loop_scope="session")
 @given(
     # Generate random user IDs
     authenticated_user_id=st.uuids().map(str),
     other_user_id=st.uuids().map(str),
     num_transactions=st.integers(min_value=1, max_value=10),
 )
-@settings(max_examples=100)
+@settings(max_examples=50, deadline=None, database=None)
 async def test_transaction_query_filters_by_user_id(
     authenticated_user_id, other_user_id, num_transactions
 ):
@@ -35,25 +49,18 @@ async def test_transaction_query_filters_by_user_id(
     This tests requirement 9.2: WHEN a user queries transactions THEN the System SHALL 
     filter results to include only transactions where the user ID matches.
     """
-    # Skip if user IDs are the same (we want to test isolation between different users)
-    if authenticated_user_id == other_user_id:
-        return
+    # Regenerate if user IDs are the same (we want to test isolation between different users)
+    assume(authenticated_user_id != other_user_id)
     
     # Create mock database session
     mock_db = AsyncMock()
     mock_result = MagicMock()
     
     # Create mock transactions - some for authenticated user, some for other user
-    mock_transactions = []
-    for i in range(num_transactions):
+    mock_transactions = _TXN_POOL[:num_transactions]
+    for i, mock_transaction in enumerate(mock_transactions):
         # Alternate between authenticated user and other user
-        user_id = authenticated_user_id if i % 2 == 0 else other_user_id
-        mock_transaction = MagicMock()
-        mock_transaction.user_id = user_id
-        mock_transaction.transaction_id = str(uuid.uuid4())
-        mock_transaction.description = f"Transaction {i}"
-        mock_transaction.amount = 100.0
-        mock_transactions.append(mock_transaction)
+        mock_transaction.user_id = authenticated_user_id if i % 2 == 0 else other_user_id
     
     # Mock the database query to return all transactions
     mock_result.scalars.return_value.all.return_value = mock_transactions
@@ -79,13 +86,13 @@ async def test_transaction_query_filters_by_user_id(
         assert transaction.user_id != other_user_id
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @given(
     # Generate random user IDs
     user_id=st.uuids().map(str),
     transaction_count=st.integers(min_value=0, max_value=20),
 )
-@settings(max_examples=100)
+@settings(max_examples=50, deadline=None, database=None)
 async def test_empty_results_when_no_user_transactions(user_id, transaction_count):
     """
     Property: For any user with no transactions, querying should return empty results.
@@ -97,12 +104,9 @@ async def test_empty_results_when_no_user_transactions(user_id, transaction_coun
     mock_result = MagicMock()
     
     # Create transactions for other users (not the querying user)
-    other_user_transactions = []
-    for i in range(transaction_count):
-        mock_transaction = MagicMock()
-        mock_transaction.user_id = str(uuid.uuid4())  # Different user
-        mock_transaction.transaction_id = str(uuid.uuid4())
-        other_user_transactions.append(mock_transaction)
+    other_user_transactions = _TXN_POOL[:transaction_count]
+    for mock_transaction in other_user_transactions:
+        mock_transaction.user_id = next(_OTHER_USER_IDS)  # Different user
     
     mock_result.scalars.return_value.all.return_value = other_user_transactions
     mock_db.execute = AsyncMock(return_value=mock_result)
@@ -118,7 +122,7 @@ async def test_empty_results_when_no_user_transactions(user_id, transaction_coun
         assert transaction.user_id != user_id
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_user_cannot_access_other_user_transaction():
     """
     Example test: Verify that attempting to access another user's transaction
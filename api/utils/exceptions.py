@@ -5,39 +5,39 @@ Custom exceptions for the API.
 
 class AuthenticationError(Exception):
     """Raised when authentication fails."""
-    pass
+    __slots__ = ()
 
 
 class AuthorizationError(Exception):
     """Raised when user lacks permission."""
-    pass
+    __slots__ = ()
 
 
 class ValidationError(Exception):
     """Raised when validation fails."""
-    pass
+    __slots__ = ()
 
 
 class ResourceNotFoundError(Exception):
     """Raised when resource is not found."""
-    pass
+    __slots__ = ()
 
 
 class NotFoundError(ResourceNotFoundError):
     """Alias for ResourceNotFoundError for backward compatibility."""
-    pass
+    __slots__ = ()
 
 
 class ForbiddenError(AuthorizationError):
     """Alias for AuthorizationError for consistency with HTTP status codes."""
-    pass
+    __slots__ = ()
 
 
 class DuplicateResourceError(Exception):
     """Raised when resource already exists."""
-    pass
+    __slots__ = ()
 
 
 class DatabaseError(Exception):
     """Raised when database operation fails."""
-    pass
+    __slots__ = ()
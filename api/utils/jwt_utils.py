@@ -2,47 +2,153 @@
 JWT token validation utilities.
 Supports both Cognito (RS256) and local (HS256) authentication modes.
 """
-from typing import Dict, Any
-import requests
-from jose import jwt, JWTError
-from jose.exceptions import ExpiredSignatureError, JWTClaimsError
-from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import re
+import threading
+import time
+from types import MappingProxyType
+import jwt
 
 from api.config import settings
 from api.utils.exceptions import AuthenticationError
 
 
-@lru_cache(maxsize=1)
+# Settings read on every decode, bound once since they don't change at runtime
+_USE_COGNITO = settings.USE_COGNITO
+_JWT_SECRET_KEY = settings.JWT_SECRET_KEY
+_COGNITO_APP_CLIENT_ID = settings.COGNITO_APP_CLIENT_ID
+
+# Cognito issuer and JWKS location, fixed for the life of the process
+COGNITO_ISSUER = (
+    f"https://cognito-idp.{settings.COGNITO_REGION}.amazonaws.com/"
+    f"{settings.COGNITO_USER_POOL_ID}"
+)
+COGNITO_JWKS_URL = f"{COGNITO_ISSUER}/.well-known/jwks.json"
+
+# jwt.decode arguments that never change between calls. The audience is
+# checked in decode_cognito_token: Cognito access tokens carry client_id and
+# no aud claim, which PyJWT would reject outright.
+_COGNITO_DECODE_KWARGS = MappingProxyType({
+    'algorithms': ("RS256",),
+    'issuer': COGNITO_ISSUER,
+    'options': MappingProxyType({
+        'verify_signature': True,
+        'verify_exp': True,
+        'verify_aud': False,
+        'verify_iss': True,
+    }),
+})
+_LOCAL_DECODE_KWARGS = MappingProxyType({
+    'algorithms': (settings.JWT_ALGORITHM,),
+    'options': MappingProxyType({
+        'verify_signature': True,
+        'verify_exp': True,
+    }),
+})
+
+# Used when the JWKS response carries no Cache-Control max-age
+JWKS_DEFAULT_TTL_SECONDS = 3600
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+# Decoded-token cache bounds: entry count, and how long before exp an entry stops being served
+TOKEN_CACHE_MAX_SIZE = 4096
+TOKEN_CACHE_EXPIRY_LEEWAY_SECONDS = 30
+
+# Reuse one keep-alive connection to Cognito so refreshes skip the TLS handshake.
+# Created on first JWKS fetch so local-auth deployments never import requests.
+_jwks_session = None
+
+
+@dataclass
+class _JWKSCache:
+    """Constructed Cognito signing keys indexed by kid, with expiry and ETag for revalidation."""
+    keys_by_kid: Dict[str, Any] = field(default_factory=dict)
+    expires_at: float = 0.0
+    etag: Optional[str] = None
+
+
+_jwks_cache = _JWKSCache()
+_jwks_lock = threading.Lock()
+
+# Verified payloads keyed by a digest of the token, never the raw bearer token
+_token_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _get_max_age(cache_control: Optional[str]) -> int:
+    """Return the max-age from a Cache-Control header, or the default TTL."""
+    match = _MAX_AGE_PATTERN.search(cache_control or "")
+    return int(match.group(1)) if match else JWKS_DEFAULT_TTL_SECONDS
+
+
+def _get_jwks_session():
+    """Return the shared JWKS HTTP session, creating it on first use."""
+    global _jwks_session
+    if _jwks_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        _jwks_session = session
+    return _jwks_session
+
+
 def get_cognito_public_keys() -> Dict[str, Any]:
     """
     Fetch Cognito public keys (JWKS) for token validation.
-    Cached to avoid repeated requests.
+    
+    Keys are cached for the response's Cache-Control max-age (one hour if
+    absent). Once expired, the cache is revalidated with If-None-Match so an
+    unchanged key set costs only a 304 on a reused connection. Each JWK is
+    turned into a cryptography public key once per refresh rather than on
+    every decode.
     
     Only used when USE_COGNITO=True.
     
     Returns:
-        Dictionary containing JWKS keys
+        Dictionary mapping key ID (kid) to public key object
         
     Raises:
         AuthenticationError: If keys cannot be fetched
     """
-    if not settings.USE_COGNITO:
+    if not _USE_COGNITO:
         raise AuthenticationError("Cognito is not enabled")
     
-    jwks_url = (
-        f"https://cognito-idp.{settings.COGNITO_REGION}.amazonaws.com/"
-        f"{settings.COGNITO_USER_POOL_ID}/.well-known/jwks.json"
-    )
-    
-    try:
-        response = requests.get(jwks_url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        raise AuthenticationError(f"Failed to fetch Cognito public keys: {str(e)}")
+    with _jwks_lock:
+        now = time.monotonic()
+        if _jwks_cache.keys_by_kid and now < _jwks_cache.expires_at:
+            return _jwks_cache.keys_by_kid
+        
+        headers = {}
+        if _jwks_cache.keys_by_kid and _jwks_cache.etag:
+            headers["If-None-Match"] = _jwks_cache.etag
+        
+        try:
+            response = _get_jwks_session().get(COGNITO_JWKS_URL, headers=headers, timeout=10)
+            if response.status_code == 304:
+                _jwks_cache.expires_at = now + _get_max_age(response.headers.get("Cache-Control"))
+                return _jwks_cache.keys_by_kid
+            response.raise_for_status()
+            jwks = response.json()
+            keys_by_kid = {
+                key['kid']: jwt.PyJWK(key, algorithm=key.get('alg', 'RS256')).key
+                for key in jwks.get('keys', []) if 'kid' in key
+            }
+        except Exception as e:
+            raise AuthenticationError(f"Failed to fetch Cognito public keys: {str(e)}")
+        
+        _jwks_cache.keys_by_kid = keys_by_kid
+        _jwks_cache.etag = response.headers.get("ETag")
+        _jwks_cache.expires_at = now + _get_max_age(response.headers.get("Cache-Control"))
+        return _jwks_cache.keys_by_kid
 
 
-def get_signing_key(token: str) -> str:
+def get_signing_key(token: str) -> Any:
     """
     Extract the signing key from JWKS based on token's kid header.
     
@@ -52,7 +158,7 @@ def get_signing_key(token: str) -> str:
         token: JWT token string
         
     Returns:
-        Public key for signature verification
+        Public key object for signature verification
         
     Raises:
         AuthenticationError: If signing key cannot be found
@@ -65,26 +171,50 @@ def get_signing_key(token: str) -> str:
         if not kid:
             raise AuthenticationError("Token missing key ID (kid)")
         
-        # Get JWKS and find matching key
-        jwks = get_cognito_public_keys()
-        
-        for key in jwks.get('keys', []):
-            if key.get('kid') == kid:
-                # Convert JWK to PEM format for python-jose
-                return key
+        # Look up the matching key in the cached JWKS
+        signing_key = get_cognito_public_keys().get(kid)
+        if signing_key is None:
+            raise AuthenticationError("Signing key not found in JWKS")
         
-        raise AuthenticationError("Signing key not found in JWKS")
+        return signing_key
         
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         raise AuthenticationError(f"Invalid token header: {str(e)}")
 
 
+def _decode(token: str, key: Any, **kwargs: Any) -> Dict[str, Any]:
+    """
+    Verify and decode a JWT, mapping PyJWT errors to AuthenticationError.
+    
+    Args:
+        token: JWT token string
+        key: Key used to verify the signature
+        **kwargs: Passed through to jwt.decode (algorithms, audience, ...)
+        
+    Returns:
+        Token payload
+        
+    Raises:
+        AuthenticationError: If the token is expired or otherwise invalid
+    """
+    try:
+        return jwt.decode(token, key, **kwargs)
+    except jwt.ExpiredSignatureError:
+        raise AuthenticationError("Token has expired")
+    except jwt.InvalidTokenError as e:
+        raise AuthenticationError(f"Invalid token: {str(e)}")
+
+
 def decode_jwt_token(token: str) -> Dict[str, Any]:
     """
     Decode and validate JWT token.
     
     Automatically detects whether to use Cognito or local validation
-    based on the USE_COGNITO setting.
+    based on the USE_COGNITO setting. Successfully verified payloads are
+    kept in a bounded LRU cache until shortly before their exp claim, so a
+    token presented repeatedly is only verified once. Each caller gets its
+    own copy of the payload, so changes to it never reach the cache.
+    Failures are never cached.
     
     Args:
         token: JWT token string
@@ -95,10 +225,31 @@ def decode_jwt_token(token: str) -> Dict[str, Any]:
     Raises:
         AuthenticationError: If token is invalid, expired, or malformed
     """
-    if settings.USE_COGNITO:
-        return decode_cognito_token(token)
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            if cached[0] > time.time():
+                _token_cache.move_to_end(cache_key)
+                # Callers may modify the payload; hand each one its own copy
+                return dict(cached[1])
+            del _token_cache[cache_key]
+    
+    if _USE_COGNITO:
+        payload = decode_cognito_token(token)
     else:
-        return decode_local_token(token)
+        payload = decode_local_token(token)
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        with _token_cache_lock:
+            _token_cache[cache_key] = (exp - TOKEN_CACHE_EXPIRY_LEEWAY_SECONDS, dict(payload))
+            _token_cache.move_to_end(cache_key)
+            if len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+                _token_cache.popitem(last=False)
+    
+    return payload
 
 
 def decode_cognito_token(token: str) -> Dict[str, Any]:
@@ -109,7 +260,8 @@ def decode_cognito_token(token: str) -> Dict[str, Any]:
     - Token signature using Cognito public keys
     - Token expiration
     - Token issuer (Cognito User Pool)
-    - Token audience (App Client ID)
+    - Token audience: client_id for access tokens, aud for ID tokens
+      (App Client ID)
     
     Args:
         token: JWT token string
@@ -120,41 +272,24 @@ def decode_cognito_token(token: str) -> Dict[str, Any]:
     Raises:
         AuthenticationError: If token is invalid, expired, or malformed
     """
-    try:
-        # Get the signing key
-        signing_key = get_signing_key(token)
-        
-        # Expected issuer
-        issuer = (
-            f"https://cognito-idp.{settings.COGNITO_REGION}.amazonaws.com/"
-            f"{settings.COGNITO_USER_POOL_ID}"
-        )
-        
-        # Decode and validate token
-        payload = jwt.decode(
-            token,
-            signing_key,
-            algorithms=["RS256"],
-            audience=settings.COGNITO_APP_CLIENT_ID,
-            issuer=issuer,
-            options={
-                'verify_signature': True,
-                'verify_exp': True,
-                'verify_aud': True,
-                'verify_iss': True,
-            }
-        )
-        
-        return payload
-        
-    except ExpiredSignatureError:
-        raise AuthenticationError("Token has expired")
-    except JWTClaimsError as e:
-        raise AuthenticationError(f"Invalid token claims: {str(e)}")
-    except JWTError as e:
-        raise AuthenticationError(f"Invalid token: {str(e)}")
-    except Exception as e:
-        raise AuthenticationError(f"Token validation failed: {str(e)}")
+    # Get the signing key
+    signing_key = get_signing_key(token)
+    
+    # Decode and validate token
+    payload = _decode(token, signing_key, **_COGNITO_DECODE_KWARGS)
+    
+    # Access tokens name the app client in client_id, ID tokens in aud
+    token_use = payload.get("token_use")
+    if token_use == "access":
+        audience = payload.get("client_id")
+    elif token_use == "id":
+        audience = payload.get("aud")
+    else:
+        raise AuthenticationError("Invalid token claims: unexpected token_use")
+    if audience != _COGNITO_APP_CLIENT_ID:
+        raise AuthenticationError("Invalid token claims: token was not issued for this app client")
+    
+    return payload
 
 
 def decode_local_token(token: str) -> Dict[str, Any]:
@@ -175,29 +310,11 @@ def decode_local_token(token: str) -> Dict[str, Any]:
     Raises:
         AuthenticationError: If token is invalid, expired, or malformed
     """
-    try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-            options={
-                'verify_signature': True,
-                'verify_exp': True,
-            }
-        )
-        
-        # Verify it's an access token (not refresh)
-        token_type = payload.get("token_type", "access")
-        if token_type == "refresh":
-            raise AuthenticationError("Cannot use refresh token for authentication")
-        
-        return payload
-        
-    except ExpiredSignatureError:
-        raise AuthenticationError("Token has expired")
-    except JWTClaimsError as e:
-        raise AuthenticationError(f"Invalid token claims: {str(e)}")
-    except JWTError as e:
-        raise AuthenticationError(f"Invalid token: {str(e)}")
-    except Exception as e:
-        raise AuthenticationError(f"Token validation failed: {str(e)}")
+    payload = _decode(token, _JWT_SECRET_KEY, **_LOCAL_DECODE_KWARGS)
+    
+    # Verify it's an access token (not refresh)
+    token_type = payload.get("token_type", "access")
+    if token_type == "refresh":
+        raise AuthenticationError("Cannot use refresh token for authentication")
+    
+    return payload
@@ -4,10 +4,27 @@ Verification script to check if the API setup is correct.
 """
 import sys
 import os
+from functools import lru_cache
 
 # Add the parent directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+
+@lru_cache(maxsize=None)
+def _scan_dir(parent):
+    """List a directory once; DirEntry caches the file type from readdir."""
+    try:
+        with os.scandir(parent or ".") as it:
+            return {entry.name: entry for entry in it}
+    except OSError:
+        return {}
+
+
+def _entry(path):
+    parent, name = os.path.split(path)
+    return _scan_dir(parent).get(name)
+
+
 def verify_imports():
     """Verify all critical imports work."""
     print("Verifying imports...")
@@ -73,7 +90,8 @@ def verify_structure():
     
     all_exist = True
     for dir_path in required_dirs:
-        if os.path.isdir(dir_path):
+        entry = _entry(dir_path)
+        if entry is not None and entry.is_dir():
             print(f"✓ {dir_path} exists")
         else:
             print(f"✗ {dir_path} missing")
@@ -100,7 +118,8 @@ def verify_files():
     
     all_exist = True
     for file_path in required_files:
-        if os.path.isfile(file_path):
+        entry = _entry(file_path)
+        if entry is not None and entry.is_file():
             print(f"✓ {file_path} exists")
         else:
             print(f"✗ {file_path} missing")
@@ -1,21 +1,30 @@
-import os
 from datetime import date, timedelta
 import json
-import tempfile
+import sys
 
 from flask import Flask, render_template, request
 
-from queries import (
-    query_cc_transactions_snowflake,
-    query_bank_transactions_snowflake,
-    cc_category_labels,
-    cc_category_values,
-    bank_income_expense_labels,
-    bank_income_expense_values,
-)
-from metrics import compute_dashboard_metrics, build_correlated_payments
-from ingest_cc_transactions import ingest_csv_file
-from ingest_bank_transactions import ingest_bank_csv_file
+# queries/metrics and the ingest modules pull in pandas and the Snowflake
+# connector, so they are imported inside the routes that need them; a
+# worker that only serves /import or static files never pays for the rest
+
+
+def overview_chart_json() -> dict[str, str]:
+    """
+    JSON for the overview charts. The summaries themselves are cached in
+    queries until the next import; encoding a few short lists is cheap.
+    """
+    from queries import get_cc_category_summary, get_bank_income_expense
+
+    cc_category_labels, cc_category_values = get_cc_category_summary()
+    bank_income_expense_labels, bank_income_expense_values = get_bank_income_expense()
+
+    return {
+        "cc_category_labels": json.dumps(cc_category_labels),
+        "cc_category_values": json.dumps(cc_category_values),
+        "bank_income_expense_labels": json.dumps(bank_income_expense_labels),
+        "bank_income_expense_values": json.dumps(bank_income_expense_values),
+    }
 
 
 # ---------------------------------------------------
@@ -27,6 +36,14 @@ app = Flask(__name__)
 
 @app.route("/", methods=["GET", "POST"])
 def index():
+    from queries import (
+        query_cc_transactions_snowflake,
+        query_bank_transactions_snowflake,
+        query_cc_summary_snowflake,
+        query_bank_summary_snowflake,
+    )
+    from metrics import compute_dashboard_metrics, build_correlated_payments
+
     today = date.today()
     default_start = today - timedelta(days=90)
 
@@ -50,44 +67,27 @@ def index():
     amount_min = float(amount_min_str) if amount_min_str else None
     amount_max = float(amount_max_str) if amount_max_str else None
 
-    # Choose dataset
+    filters = dict(
+        desc_filter=desc_filter,
+        amount_min=amount_min,
+        amount_max=amount_max,
+    )
+
+    # Choose dataset; cards and charts come from a Snowflake-side summary,
+    # the detail query only feeds the (limited) transactions table
     if dataset == "bank":
-        df = query_bank_transactions_snowflake(
-            start_str,
-            end_str,
-            desc_filter=desc_filter,
-            _category_filter=category_filter,
-            amount_min=amount_min,
-            amount_max=amount_max,
-            limit=2000,
-        )
+        filters["_category_filter"] = category_filter
+        df = query_bank_transactions_snowflake(start_str, end_str, limit=2000, **filters)
+        summary = query_bank_summary_snowflake(start_str, end_str, **filters)
         source_label = "Snowflake · Bank"
-    elif dataset == "correlated":
-        # For charts & cards, we'll still show CC-only for now
-        df = query_cc_transactions_snowflake(
-            start_str,
-            end_str,
-            desc_filter=desc_filter,
-            category_filter=category_filter,
-            amount_min=amount_min,
-            amount_max=amount_max,
-            limit=2000,
-        )
-        source_label = "Snowflake · Credit Card"
     else:
-        # Default: CC
-        df = query_cc_transactions_snowflake(
-            start_str,
-            end_str,
-            desc_filter=desc_filter,
-            category_filter=category_filter,
-            amount_min=amount_min,
-            amount_max=amount_max,
-            limit=2000,
-        )
+        # Default: CC. For charts & cards, "correlated" still shows CC-only for now
+        filters["category_filter"] = category_filter
+        df = query_cc_transactions_snowflake(start_str, end_str, limit=2000, **filters)
+        summary = query_cc_summary_snowflake(start_str, end_str, **filters)
         source_label = "Snowflake · Credit Card"
 
-    metrics = compute_dashboard_metrics(df, start_str, end_str)
+    metrics = compute_dashboard_metrics(summary, start_str, end_str)
 
     rows = df.to_dict(orient="records")
 
@@ -122,10 +122,7 @@ def index():
         spend_cat_values=metrics["spend_cat_values"],
         income_cat_labels=metrics["income_cat_labels"],
         income_cat_values=metrics["income_cat_values"],
-        cc_category_labels=json.dumps(cc_category_labels),
-        cc_category_values=json.dumps(cc_category_values),
-        bank_income_expense_labels=json.dumps(bank_income_expense_labels),
-        bank_income_expense_values=json.dumps(bank_income_expense_values),
+        **overview_chart_json(),
         # rows + correlations
         rows=rows,
         correlations=correlations,
@@ -160,25 +157,28 @@ def import_dashboard():
             else:
                 bank_error = "Please enter an account id (e.g. bank_main)."
         else:
-            temp_path = None
             try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp:
-                    temp_path = tmp.name
-                    file.save(temp_path)
-
+                # Parse straight from the upload stream; no temp file needed
                 if import_type == "cc":
-                    cc_summary = ingest_csv_file(temp_path, account_id)
+                    from ingest_cc_transactions import ingest_csv_file
+
+                    cc_summary = ingest_csv_file(file.stream, account_id)
                 else:
-                    bank_summary = ingest_bank_csv_file(temp_path, account_id)
+                    from ingest_bank_transactions import ingest_bank_csv_file
+
+                    bank_summary = ingest_bank_csv_file(file.stream, account_id)
+
+                # Don't serve pre-import results from the dashboard query
+                # cache; if queries was never loaded there is nothing cached
+                queries = sys.modules.get("queries")
+                if queries is not None:
+                    queries.clear_query_cache()
 
             except Exception as exc:
                 if import_type == "cc":
                     cc_error = f"Import failed: {exc}"
                 else:
                     bank_error = f"Import failed: {exc}"
-            finally:
-                if temp_path and os.path.exists(temp_path):
-                    os.remove(temp_path)
 
     return render_template(
         "import.html",
@@ -0,0 +1,115 @@
+import csv
+import io
+import os
+from typing import IO, Dict, Iterator, List, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+# ---------------------------------------------------
+# Streaming CSV reader shared by the bank and credit card ingests
+# ---------------------------------------------------
+
+
+class _PrefixedStream(io.RawIOBase):
+    """Binary stream that replays bytes already read before the rest of a file."""
+
+    def __init__(self, prefix: bytes, rest: IO[bytes]):
+        self._prefix = prefix
+        self._rest = rest
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            n = min(len(buffer), len(self._prefix))
+            buffer[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+            return n
+        data = self._rest.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def header_field_map(header: List[str]) -> Dict[str, int]:
+    """Map each lower-cased, stripped header name to its column position."""
+    return {name.lower().strip(): i for i, name in enumerate(header)}
+
+
+def _ragged_rows_batch(rows: List[str], names: List[str]) -> pa.RecordBatch:
+    """
+    Parse rows whose field count doesn't match the header, padding short
+    ones with nulls and dropping extra fields, as csv.DictReader would.
+    """
+    width = len(names)
+    columns: List[List] = [[] for _ in names]
+    for fields in csv.reader(rows):
+        fields = fields[:width] + [None] * (width - len(fields))
+        for column, value in zip(columns, fields):
+            column.append(value)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, pa.string()) for column in columns], names=names
+    )
+
+
+def iter_csv_batches(
+    csv_source: Union[str, os.PathLike, IO[bytes]],
+    block_size: int,
+    label: str = "CSV",
+) -> Iterator[Tuple[List[str], pa.RecordBatch]]:
+    """
+    Stream a CSV file (a path or a binary file object such as an upload
+    stream) with pyarrow's multi-threaded reader and yield
+    (header, batch) pairs, one per parsed block.
+
+    The header is read with the csv module so the column count is known up
+    front. That lets every column be typed as string, as csv.DictReader
+    would give, including columns whose header cell is empty. Rows with
+    too few or too many fields are set aside by the Arrow parser and
+    yielded as an extra batch after the block they came from.
+
+    The first pair always carries an empty batch, so callers can check the
+    header before any data is parsed.
+    """
+    owns_file = isinstance(csv_source, (str, os.PathLike))
+    csv_file = open(csv_source, "rb") if owns_file else csv_source
+    try:
+        prefix = csv_file.read(block_size)
+        header = next(
+            csv.reader(io.StringIO(prefix.decode("utf-8-sig", errors="replace"))),
+            None,
+        )
+        if not header:
+            raise RuntimeError(f"{label} has no header row.")
+
+        names = [f"f{i}" for i in range(len(header))]
+        yield header, _ragged_rows_batch([], names)
+
+        ragged_rows: List[str] = []
+
+        def set_aside(row) -> str:
+            ragged_rows.append(row.text)
+            return "skip"
+
+        reader = pa_csv.open_csv(
+            _PrefixedStream(prefix, csv_file),
+            read_options=pa_csv.ReadOptions(
+                column_names=names, skip_rows=1, block_size=block_size
+            ),
+            parse_options=pa_csv.ParseOptions(invalid_row_handler=set_aside),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=dict.fromkeys(names, pa.string())
+            ),
+        )
+        for batch in reader:
+            if batch.num_rows:
+                yield header, batch
+            if ragged_rows:
+                yield header, _ragged_rows_batch(ragged_rows, names)
+                ragged_rows.clear()
+        if ragged_rows:
+            yield header, _ragged_rows_batch(ragged_rows, names)
+    finally:
+        if owns_file:
+            csv_file.close()
@@ -1,24 +1,30 @@
+import atexit
 import os
+import queue
+import time
 from dotenv import load_dotenv
 import snowflake.connector
 
 load_dotenv()
 
-SF_USER = os.getenv("SF_USER")
-SF_PASSWORD = os.getenv("SF_PASSWORD")
-SF_ACCOUNT = os.getenv("SF_ACCOUNT")
-SF_WAREHOUSE = os.getenv("SF_WAREHOUSE")
-SF_DATABASE = os.getenv("SF_DATABASE")
-SF_SCHEMA = os.getenv("SF_SCHEMA")
+# Warm connections kept for reuse; a connection idle longer than
+# POOL_IDLE_CHECK_SECONDS is pinged before being handed out again
+POOL_SIZE = 8
+POOL_IDLE_CHECK_SECONDS = 300
 
-def get_snowflake_connection():
+_pool: "queue.Queue[tuple[snowflake.connector.SnowflakeConnection, float]]" = queue.Queue(maxsize=POOL_SIZE)
+
+
+def _connect():
+    # Read env at connect time so scripts that load dev.env after importing
+    # this module still pick up their settings
     params = {
-        "user": SF_USER,
-        "password": SF_PASSWORD,
-        "account": SF_ACCOUNT,
-        "warehouse": SF_WAREHOUSE,
-        "database": SF_DATABASE,
-        "schema": SF_SCHEMA,
+        "user": os.getenv("SF_USER"),
+        "password": os.getenv("SF_PASSWORD"),
+        "account": os.getenv("SF_ACCOUNT"),
+        "warehouse": os.getenv("SF_WAREHOUSE"),
+        "database": os.getenv("SF_DATABASE"),
+        "schema": os.getenv("SF_SCHEMA"),
     }
     missing = [k for k, v in params.items() if not v]
     if missing:
@@ -28,13 +34,91 @@ def get_snowflake_connection():
         params["role"] = role
     return snowflake.connector.connect(**params)
 
-def run_query_df(sql: str, params: dict | None = None):
+
+def _is_alive(conn) -> bool:
+    if conn.is_closed():
+        return False
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT 1")
+        finally:
+            cur.close()
+        return True
+    except snowflake.connector.Error:
+        return False
+
+
+def get_snowflake_connection():
+    """
+    Return a Snowflake connection, reusing a pooled one when available.
+
+    Callers should hand the connection back with release_connection()
+    rather than closing it.
+    """
+    while True:
+        try:
+            conn, released_at = _pool.get_nowait()
+        except queue.Empty:
+            return _connect()
+        if time.monotonic() - released_at < POOL_IDLE_CHECK_SECONDS and not conn.is_closed():
+            return conn
+        if _is_alive(conn):
+            return conn
+        conn.close()
+
+
+def release_connection(conn) -> None:
+    """Return a connection to the pool, closing it if the pool is full."""
+    if conn.is_closed():
+        return
+    try:
+        _pool.put_nowait((conn, time.monotonic()))
+    except queue.Full:
+        conn.close()
+
+
+@atexit.register
+def _close_pool() -> None:
+    """Log pooled connections out cleanly when the process exits."""
+    while True:
+        try:
+            conn, _ = _pool.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            conn.close()
+        except snowflake.connector.Error:
+            pass
+
+
+def _run_query(sql: str, params: dict | None, fetch):
     conn = get_snowflake_connection()
-    cur = conn.cursor()
     try:
-        cur.execute(sql, params or {})
-        df = cur.fetch_pandas_all()
+        cur = conn.cursor()
+        try:
+            cur.execute(sql, params or {})
+            return fetch(cur)
+        finally:
+            cur.close()
     finally:
-        cur.close()
-        conn.close()
-    return df
\ No newline at end of file
+        release_connection(conn)
+
+
+def run_query_df(sql: str, params: dict | None = None):
+    """
+    Run a query and return the result as a pandas DataFrame.
+
+    Results are fetched in Snowflake's Arrow format and converted column by
+    column; never fall back to fetchall() and building frames from rows.
+    """
+    return _run_query(sql, params, lambda cur: cur.fetch_pandas_all())
+
+
+def run_query_arrow(sql: str, params: dict | None = None):
+    """
+    Run a query and return the result as a pyarrow Table, for callers that
+    only need a few values and can skip the pandas conversion.
+    """
+    # An empty result is an empty table rather than None
+    return _run_query(sql, params, lambda cur: cur.fetch_arrow_all(force_return_table=True))
@@ -1,13 +1,104 @@
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
+from botocore.config import Config
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+import numpy as np
 import pandas as pd
 
 DDB_REGION = os.getenv("AWS_REGION", "us-east-1")
 DDB_TABLE = os.getenv("DDB_TABLE", "bank_transactions")
 
-dynamodb = boto3.resource("dynamodb", region_name=DDB_REGION)
+# One resource per process, shared by every request. The keep-alive pool is
+# sized well above QUERY_SEGMENTS so concurrent dashboard requests reuse
+# warm TLS connections instead of waiting on (or re-opening) them
+DDB_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    tcp_keepalive=True,
+)
+
+dynamodb = boto3.resource("dynamodb", region_name=DDB_REGION, config=DDB_CLIENT_CONFIG)
 txn_table = dynamodb.Table(DDB_TABLE)
+query_paginator = dynamodb.meta.client.get_paginator("query")
+
+# Wide date ranges are split into this many day sub-ranges that are paged
+# concurrently; boto3 clients are thread-safe and release the GIL on I/O
+QUERY_SEGMENTS = 4
+
+# Shared by all requests, so each query doesn't spin up its own threads
+QUERY_WORKERS = 16
+_segment_pool = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="ddb-query")
+
+
+def _split_date_range(start_date: str, end_date: str, segments: int) -> list[tuple[str, str]]:
+    """Split an inclusive ISO date range into at most `segments` contiguous day ranges."""
+    try:
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+    except ValueError:
+        return [(start_date, end_date)]
+    days = (end - start).days + 1
+    if days <= 1:
+        return [(start_date, end_date)]
+
+    segments = min(segments, days)
+    step, extra = divmod(days, segments)
+    ranges = []
+    seg_start = start
+    for i in range(segments):
+        seg_end = seg_start + timedelta(days=step + (1 if i < extra else 0) - 1)
+        ranges.append((seg_start.isoformat(), seg_end.isoformat()))
+        seg_start = seg_end + timedelta(days=1)
+    return ranges
+
+
+class _SegmentProgress:
+    """
+    Item counts of the segments of one query, so a segment stops paging as
+    soon as it and the segments before it already hold `limit` items.
+    """
+
+    def __init__(self, segments: int, limit: int):
+        self._counts = [0] * segments
+        self._limit = limit
+        self._lock = threading.Lock()
+
+    def record(self, index: int, count: int) -> bool:
+        """Record a segment's item count; return True once it can stop."""
+        with self._lock:
+            self._counts[index] = count
+            return sum(self._counts[: index + 1]) >= self._limit
+
+    def done(self, index: int) -> bool:
+        with self._lock:
+            return sum(self._counts[:index]) >= self._limit
+
+
+def _query_segment(
+    query_kwargs: dict,
+    seg_start: str,
+    seg_end: str,
+    progress: _SegmentProgress,
+    index: int,
+) -> list[dict]:
+    kwargs = dict(query_kwargs)
+    kwargs["KeyConditionExpression"] = (
+        Key("user_id").eq("household") & Key("transaction_date").between(seg_start, seg_end)
+    )
+    items = []
+    # Earlier segments may already hold the limit before this one starts
+    if progress.done(index):
+        return items
+    for page in query_paginator.paginate(**kwargs):
+        items.extend(page.get("Items", []))
+        if progress.record(index, len(items)):
+            break
+    return items
+
 
 def query_transactions_from_dynamo(
     start_date: str,
@@ -18,24 +109,43 @@ def query_transactions_from_dynamo(
     amount_max: float | None = None,
     limit: int = 2000,
 ) -> pd.DataFrame:
-    # Query by date range on GSI
-    resp = txn_table.query(
-        IndexName="gsi_user_date",
-        KeyConditionExpression=Key("user_id").eq("household") &
-                               Key("transaction_date").between(start_date, end_date)
-    )
+    # Amount bounds are evaluated by DynamoDB so non-matching items never
+    # come back over the wire. Text filters stay in pandas below because
+    # DynamoDB's contains() is case-sensitive.
+    filter_expr = None
+    if amount_min is not None:
+        filter_expr = Attr("amount").gte(Decimal(str(amount_min)))
+    if amount_max is not None:
+        cond = Attr("amount").lte(Decimal(str(amount_max)))
+        filter_expr = cond if filter_expr is None else filter_expr & cond
 
-    items = resp.get("Items", [])
+    query_kwargs = {
+        "TableName": DDB_TABLE,
+        "IndexName": "gsi_user_date",
+        "PaginationConfig": {"PageSize": limit},
+    }
+    if filter_expr is not None:
+        query_kwargs["FilterExpression"] = filter_expr
 
-    # Handle pagination if needed (lots of data)
-    while "LastEvaluatedKey" in resp and len(items) < limit:
-        resp = txn_table.query(
-            IndexName="gsi_user_date",
-            KeyConditionExpression=Key("user_id").eq("household") &
-                                   Key("transaction_date").between(start_date, end_date),
-            ExclusiveStartKey=resp["LastEvaluatedKey"]
-        )
-        items.extend(resp.get("Items", []))
+    # Query by date range on GSI, one concurrent pager per day sub-range.
+    # A segment stops paging once it and the earlier segments together hold
+    # `limit` items, so concatenating them in date order keeps the earliest
+    # `limit` items, as a serial scan would, without reading much past them.
+    ranges = _split_date_range(start_date, end_date, QUERY_SEGMENTS)
+    progress = _SegmentProgress(len(ranges), limit)
+    if len(ranges) == 1:
+        items = _query_segment(query_kwargs, *ranges[0], progress, 0)
+    else:
+        futures = [
+            _segment_pool.submit(_query_segment, query_kwargs, seg_start, seg_end, progress, i)
+            for i, (seg_start, seg_end) in enumerate(ranges)
+        ]
+        items = []
+        for future in futures:
+            items.extend(future.result())
+            if len(items) >= limit:
+                # Later segments see the same counts and stop after their current page
+                break
 
     # Convert to DataFrame
     if not items:
@@ -61,20 +171,17 @@ def query_transactions_from_dynamo(
     # Convert types
     df["AMOUNT"] = df["AMOUNT"].astype(float)
 
-    # Apply filters in Python
+    # Apply text filters in Python, fused into one mask so the frame is
+    # sliced once; regex=False treats user input literally
+    mask = np.ones(len(df), dtype=bool)
     if desc_filter:
-        mask = df["DESCRIPTION"].str.contains(desc_filter, case=False, na=False)
-        df = df[mask]
+        mask &= df["DESCRIPTION"].str.contains(desc_filter, case=False, na=False, regex=False).to_numpy(dtype=bool)
 
     if category_filter:
-        mask = df["CATEGORY"].str.contains(category_filter, case=False, na=False)
-        df = df[mask]
+        mask &= df["CATEGORY"].str.contains(category_filter, case=False, na=False, regex=False).to_numpy(dtype=bool)
 
-    if amount_min is not None:
-        df = df[df["AMOUNT"] >= amount_min]
-
-    if amount_max is not None:
-        df = df[df["AMOUNT"] <= amount_max]
+    if not mask.all():
+        df = df.loc[mask]
 
     # Limit rows
     if len(df) > limit:
@@ -1,6 +1,5 @@
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-import random
 
 def query_transactions_from_dynamo(
     start_date: str,
@@ -29,40 +28,37 @@ def query_transactions_from_dynamo(
         "Groceries", "Health & Fitness", "Transportation", "Utilities"
     ]
     
-    # Generate mock data
-    rows = []
-    start = pd.to_datetime(start_date)
-    end = pd.to_datetime(end_date)
-    current = start
-    
-    while current <= end and len(rows) < limit:
-        num_tx_today = random.randint(1, 4)
-        for _ in range(num_tx_today):
-            amount = round(random.uniform(-150, 50), 2)
-            merchant = random.choice(merchants)
-            category = random.choice(categories)
-            
-            # Apply filters
-            if desc_filter and desc_filter.lower() not in merchant.lower():
-                continue
-            if category_filter and category_filter.lower() not in category.lower():
-                continue
-            if amount_min is not None and amount < amount_min:
-                continue
-            if amount_max is not None and amount > amount_max:
-                continue
-            
-            rows.append({
-                "TRANSACTION_DATE": current.date(),
-                "POST_DATE": current.date(),
-                "DESCRIPTION": merchant,
-                "CATEGORY": category,
-                "TYPE": "debit" if amount < 0 else "credit",
-                "AMOUNT": amount,
-                "MEMO": f"Mock transaction {len(rows)}"
-            })
-        
-        current += timedelta(days=1)
-    
-    df = pd.DataFrame(rows[:limit])
-    return df
\ No newline at end of file
+    # Generate mock data for every day at once: 1-4 transactions per day
+    rng = np.random.default_rng()
+    days = pd.date_range(start_date, end_date, freq="D").date
+    per_day = rng.integers(1, 5, len(days))
+    total = int(per_day.sum())
+
+    amounts = rng.uniform(-150, 50, total).round(2)
+    descriptions = np.asarray(merchants)[rng.integers(0, len(merchants), total)]
+    cats = np.asarray(categories)[rng.integers(0, len(categories), total)]
+    dates = np.repeat(days, per_day)
+
+    # Apply filters as one mask
+    mask = np.ones(total, dtype=bool)
+    if desc_filter:
+        mask &= np.char.find(np.char.lower(descriptions), desc_filter.lower()) >= 0
+    if category_filter:
+        mask &= np.char.find(np.char.lower(cats), category_filter.lower()) >= 0
+    if amount_min is not None:
+        mask &= amounts >= amount_min
+    if amount_max is not None:
+        mask &= amounts <= amount_max
+
+    amounts = amounts[mask][:limit]
+    dates = dates[mask][:limit]
+    df = pd.DataFrame({
+        "TRANSACTION_DATE": dates,
+        "POST_DATE": dates,
+        "DESCRIPTION": descriptions[mask][:limit],
+        "CATEGORY": cats[mask][:limit],
+        "TYPE": np.where(amounts < 0, "debit", "credit"),
+        "AMOUNT": amounts,
+        "MEMO": [f"Mock transaction {i}" for i in range(len(amounts))],
+    })
+    return df
@@ -1,13 +1,18 @@
 import argparse
-import csv
+import hashlib
 import os
 import uuid
-from datetime import datetime
-from typing import Dict, Any, List
+from datetime import date, datetime
+from functools import lru_cache
+from typing import IO, Iterable, Iterator, Union
 from pathlib import Path
 
-import snowflake.connector
+import pandas as pd
 from dotenv import load_dotenv
+from snowflake.connector.pandas_tools import write_pandas
+
+from csv_stream import header_field_map, iter_csv_batches
+from db import get_snowflake_connection, release_connection
 
 # ---------------------------------------------------
 # Load dev.env from the directory of this script
@@ -25,30 +30,9 @@ else:
 
 
 # ---------------------------------------------------
-# Snowflake helpers
+# Parsing helpers
 # ---------------------------------------------------
 
-def get_snowflake_connection():
-    """Create and return a Snowflake connection using env vars."""
-    conn_params = {
-        "user": os.getenv("SF_USER"),
-        "password": os.getenv("SF_PASSWORD"),
-        "account": os.getenv("SF_ACCOUNT"),
-        "warehouse": os.getenv("SF_WAREHOUSE"),
-        "database": os.getenv("SF_DATABASE"),
-        "schema": os.getenv("SF_SCHEMA"),
-    }
-    missing = [k for k, v in conn_params.items() if not v]
-    if missing:
-        raise RuntimeError(f"Missing Snowflake env vars: {', '.join(missing)}")
-
-    role = os.getenv("SF_ROLE")
-    if role:
-        conn_params["role"] = role
-
-    return snowflake.connector.connect(**conn_params)
-
-
 def parse_date(value: str) -> str | None:
     """Parse a date string and return it as ISO (YYYY-MM-DD) or None."""
     if not value:
@@ -58,8 +42,28 @@ def parse_date(value: str) -> str | None:
     if not value:
         return None
 
-    # Adjust formats here if your bank uses something else.
-    for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
+    return _parse_date_str(value)
+
+
+# Adjust formats here if your bank uses something else.
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y")
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(value: str) -> str:
+    """
+    Parse a stripped, non-empty date string to ISO format.
+
+    A bank export only holds a few hundred distinct dates, so results are
+    cached. Canonical ISO dates skip strptime entirely.
+    """
+    if len(value) == 10:
+        try:
+            return date.fromisoformat(value).isoformat()
+        except ValueError:
+            pass
+
+    for fmt in DATE_FORMATS:
         try:
             d = datetime.strptime(value, fmt).date()
             return d.isoformat()
@@ -82,26 +86,88 @@ def clean_amount(value: str) -> float:
         raise ValueError(f"Invalid amount format: {value!r}")
 
 
-def generate_transaction_id(row: Dict[str, Any], account_id: str) -> str:
-    """Generate a deterministic UUID based on key fields."""
-    key_parts = [
-        row.get("posted_date", "") or "",
-        row.get("effective_date", "") or "",
-        (row.get("description", "") or "").upper(),
-        str(row.get("amount", "") or "").strip(),
-        account_id.strip(),
-    ]
-    key = "|".join(key_parts)
-    return str(uuid.uuid5(uuid.NAMESPACE_DNS, key))
+# SHA-1 state after absorbing the uuid5 namespace; each ID copies it and only
+# hashes the key, which is exactly what uuid.uuid5(NAMESPACE_DNS, key) does
+_UUID5_DNS_SHA1 = hashlib.sha1(uuid.NAMESPACE_DNS.bytes, usedforsecurity=False)
+
+
+def _uuid5_dns(key: str) -> str:
+    h = _UUID5_DNS_SHA1.copy()
+    h.update(key.encode("utf-8"))
+    return str(uuid.UUID(bytes=h.digest()[:16], version=5))
+
+
+def generate_transaction_ids(
+    posted_dates: pd.Series,
+    effective_dates: pd.Series,
+    descriptions: pd.Series,
+    amounts: pd.Series,
+    account_id: str,
+) -> list[str]:
+    """
+    Generate deterministic UUIDs based on key fields, one per row.
+
+    The key string must stay byte-for-byte identical to what earlier imports
+    produced, otherwise re-imported rows would no longer dedupe on MERGE.
+    """
+    keys = (
+        posted_dates.fillna("")
+        + "|" + effective_dates.fillna("")
+        + "|" + descriptions.str.upper()
+        # A zero amount has always contributed an empty key part
+        + "|" + pd.Series([str(a) if a else "" for a in amounts.tolist()], index=amounts.index)
+        + "|" + account_id.strip()
+    )
+    return [_uuid5_dns(key) for key in keys.tolist()]
+
+
+def clean_amounts(values: pd.Series) -> pd.Series:
+    """Vectorized clean_amount for a column of bank amount strings."""
+    cleaned = values.str.strip().str.replace(r"[$,]", "", regex=True)
+    try:
+        return cleaned.fillna("0").astype("float64")
+    except ValueError:
+        # Re-run row by row so the error names the offending value
+        return values.map(clean_amount)
+
+
+def _strip_or_none(values: pd.Series) -> pd.Series:
+    """Strip whitespace, turning missing or blank values into None."""
+    stripped = values.fillna("").str.strip()
+    return stripped.where(stripped != "", None)
 
 
 # ---------------------------------------------------
 # CSV handling for BANK file
 # ---------------------------------------------------
 
-def read_csv_rows(csv_path: str) -> List[Dict[str, Any]]:
+# Lower-cased bank CSV header -> internal column name
+BANK_CSV_FIELDS = {
+    "posted date": "posted_date",
+    "effective date": "effective_date",
+    "transaction": "transaction_type",
+    "amount": "amount",
+    "balance": "running_balance",
+    "description": "description",
+    "check#": "check_number",
+    "memo": "memo",
+}
+_BANK_INTERNAL_NAMES = list(BANK_CSV_FIELDS.values())
+
+
+# Bytes per parsed block; each block becomes one DataFrame chunk
+CSV_BLOCK_SIZE = 8 << 20
+
+
+def iter_csv_chunks(
+    csv_source: Union[str, os.PathLike, IO[bytes]],
+) -> Iterator[pd.DataFrame]:
     """
-    Read the BANK CSV file and return a list of normalized rows.
+    Read the BANK CSV file (a path or a binary file object such as an
+    upload stream) and yield DataFrames of raw string columns.
+
+    Parsing uses pyarrow's multi-threaded streaming CSV reader (see
+    csv_stream.iter_csv_batches), with every column read as a string.
 
     Bank CSV Columns (case-insensitive):
       - Posted Date
@@ -113,215 +179,190 @@ def read_csv_rows(csv_path: str) -> List[Dict[str, Any]]:
       - Check#
       - Memo
     """
-    with open(csv_path, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        if not reader.fieldnames:
-            raise RuntimeError("Bank CSV has no header row.")
-
-        field_map = {name.lower().strip(): name for name in reader.fieldnames}
-
-        required_bank_fields = [
-            "posted date",
-            "effective date",
-            "transaction",
-            "amount",
-            "balance",
-            "description",
-            "check#",
-            "memo",
-        ]
-
-        for col in required_bank_fields:
-            if col not in field_map:
-                raise RuntimeError(
-                    f"Bank CSV is missing required column: {col} "
-                    f"(present columns: {reader.fieldnames})"
-                )
-
-        rows: List[Dict[str, Any]] = []
-        for raw in reader:
-            rows.append({
-                "posted_date": raw[field_map["posted date"]],
-                "effective_date": raw[field_map["effective date"]],
-                "description": raw[field_map["description"]],
-                "transaction_type": raw[field_map["transaction"]],
-                "amount": raw[field_map["amount"]],
-                "running_balance": raw[field_map["balance"]],
-                "check_number": raw[field_map["check#"]],
-                "memo": raw[field_map["memo"]],
-            })
-
-    return rows
-
-
-def prepare_rows_for_insert(csv_rows: List[Dict[str, Any]], account_id: str) -> List[Dict[str, Any]]:
-    """Convert raw BANK CSV rows into a structure ready for Snowflake insert."""
-    prepared: List[Dict[str, Any]] = []
-
-    for r in csv_rows:
-        posted_date_iso = parse_date(r["posted_date"])
-        effective_date_iso = parse_date(r["effective_date"])
-        description = (r["description"] or "").strip()
-        transaction_type = (r["transaction_type"] or "").strip() or None
-        amount = clean_amount(r["amount"])
-        running_balance = clean_amount(r["running_balance"])
-        check_number = (r["check_number"] or "").strip() or None
-        memo = (r["memo"] or "").strip() or None
-
-        tx_id = generate_transaction_id(
-            {
-                "posted_date": posted_date_iso or "",
-                "effective_date": effective_date_iso or "",
-                "description": description,
-                "amount": amount,
-            },
-            account_id=account_id,
-        )
-
-        prepared.append({
-            "TRANSACTION_ID": tx_id,
-            "POSTED_DATE": posted_date_iso,
-            "EFFECTIVE_DATE": effective_date_iso,
-            "DESCRIPTION": description,
-            "TRANSACTION_TYPE": transaction_type,
-            "AMOUNT": amount,
-            "RUNNING_BALANCE": running_balance,
-            "CHECK_NUMBER": check_number,
-            "MEMO": memo,
-            "ACCOUNT_ID": account_id,
-        })
-
-    return prepared
+    # Positions of the BANK_CSV_FIELDS columns, resolved once from the header
+    indices = None
+    for header, batch in iter_csv_batches(csv_source, CSV_BLOCK_SIZE, label="Bank CSV"):
+        if indices is None:
+            field_map = header_field_map(header)
+            for col in BANK_CSV_FIELDS:
+                if col not in field_map:
+                    raise RuntimeError(
+                        f"Bank CSV is missing required column: {col} "
+                        f"(present columns: {header})"
+                    )
+            indices = [field_map[col] for col in BANK_CSV_FIELDS]
+        if not batch.num_rows:
+            continue
+
+        # Only the needed columns are converted, already in internal order
+        yield batch.select(indices).rename_columns(_BANK_INTERNAL_NAMES).to_pandas()
+
+
+def prepare_chunk(raw: pd.DataFrame, account_id: str) -> pd.DataFrame:
+    """Convert a chunk of raw BANK CSV rows into BANK_COLUMNS ready for Snowflake."""
+    posted_dates = raw["posted_date"].fillna("").map(parse_date)
+    effective_dates = raw["effective_date"].fillna("").map(parse_date)
+    descriptions = raw["description"].fillna("").str.strip()
+    amounts = clean_amounts(raw["amount"])
+
+    return pd.DataFrame({
+        "TRANSACTION_ID": generate_transaction_ids(
+            posted_dates, effective_dates, descriptions, amounts, account_id
+        ),
+        "POSTED_DATE": posted_dates,
+        "EFFECTIVE_DATE": effective_dates,
+        "DESCRIPTION": descriptions,
+        "TRANSACTION_TYPE": _strip_or_none(raw["transaction_type"]),
+        "AMOUNT": amounts,
+        "RUNNING_BALANCE": clean_amounts(raw["running_balance"]),
+        "CHECK_NUMBER": _strip_or_none(raw["check_number"]),
+        "MEMO": _strip_or_none(raw["memo"]),
+        "ACCOUNT_ID": account_id,
+    }, index=raw.index)
+
+
+def iter_prepared_chunks(
+    csv_source: Union[str, os.PathLike, IO[bytes]],
+    account_id: str,
+) -> Iterator[pd.DataFrame]:
+    """Stream the BANK CSV as insert-ready DataFrame chunks."""
+    for raw in iter_csv_chunks(csv_source):
+        yield prepare_chunk(raw, account_id)
 
 
 # ---------------------------------------------------
 # Snowflake insert / merge logic
 # ---------------------------------------------------
 
-def insert_rows(conn, rows: List[Dict[str, Any]], dry_run: bool = False):
-    """Insert rows into BANK_TRANSACTIONS using MERGE on TRANSACTION_ID."""
-    if not rows:
-        print("No bank rows to insert.")
-        return
+BANK_COLUMNS = [
+    "TRANSACTION_ID",
+    "POSTED_DATE",
+    "EFFECTIVE_DATE",
+    "DESCRIPTION",
+    "TRANSACTION_TYPE",
+    "AMOUNT",
+    "RUNNING_BALANCE",
+    "CHECK_NUMBER",
+    "MEMO",
+    "ACCOUNT_ID",
+]
+
+STAGE_TABLE = "BANK_TRANSACTIONS_STAGE"
+
+CREATE_STAGE_SQL = f"""
+    CREATE OR REPLACE TEMPORARY TABLE {STAGE_TABLE} (
+      TRANSACTION_ID      STRING,
+      POSTED_DATE         DATE,
+      EFFECTIVE_DATE      DATE,
+      DESCRIPTION         VARCHAR(255),
+      TRANSACTION_TYPE    VARCHAR(50),
+      AMOUNT              NUMBER(18, 2),
+      RUNNING_BALANCE     NUMBER(18, 2),
+      CHECK_NUMBER        VARCHAR(50),
+      MEMO                VARCHAR(255),
+      ACCOUNT_ID          VARCHAR(100)
+    )
+"""
+
+MERGE_FROM_STAGE_SQL = f"""
+    MERGE INTO BANK_TRANSACTIONS AS tgt
+    USING {STAGE_TABLE} AS src
+    ON tgt.TRANSACTION_ID = src.TRANSACTION_ID
+    WHEN NOT MATCHED THEN
+      INSERT ({", ".join(BANK_COLUMNS)})
+      VALUES ({", ".join(f"src.{col}" for col in BANK_COLUMNS)})
+"""
+
+# Staged rows whose TRANSACTION_ID is not in BANK_TRANSACTIONS yet; a
+# re-import of an already loaded file finds none and skips the MERGE
+COUNT_NEW_STAGED_SQL = f"""
+    SELECT COUNT(*)
+    FROM {STAGE_TABLE} AS src
+    WHERE NOT EXISTS (
+      SELECT 1 FROM BANK_TRANSACTIONS AS tgt
+      WHERE tgt.TRANSACTION_ID = src.TRANSACTION_ID
+    )
+"""
+
 
+def insert_rows(conn, frames: Iterable[pd.DataFrame], dry_run: bool = False) -> tuple[int, int]:
+    """
+    Insert rows into BANK_TRANSACTIONS using MERGE on TRANSACTION_ID.
+
+    Each DataFrame of BANK_COLUMNS is bulk-loaded into a temporary stage
+    table with write_pandas (Parquet upload + COPY INTO), then everything is
+    merged into BANK_TRANSACTIONS with a single MERGE statement. Frames are
+    consumed one at a time so the whole file never has to be held in
+    memory. The MERGE is skipped when a probe finds no new TRANSACTION_IDs.
+
+    Returns (rows_processed, rows_inserted).
+    """
     if dry_run:
-        print(f"[DRY RUN] Would insert/merge up to {len(rows)} bank rows.")
-        return
+        row_count = sum(len(frame) for frame in frames)
+        print(f"[DRY RUN] Would insert/merge up to {row_count} bank rows.")
+        return row_count, 0
 
+    row_count = 0
+    inserted = 0
     cursor = conn.cursor()
     try:
-        chunk_size = 200
-        for i in range(0, len(rows), chunk_size):
-            chunk = rows[i : i + chunk_size]
-
-            values_clause_parts = []
-            params: Dict[str, Any] = {}
-
-            for idx, r in enumerate(chunk):
-                suffix = f"_{i}_{idx}"
-                values_clause_parts.append(
-                    f"(%(TRANSACTION_ID{suffix})s, %(POSTED_DATE{suffix})s, "
-                    f"%(EFFECTIVE_DATE{suffix})s, %(DESCRIPTION{suffix})s, "
-                    f"%(TRANSACTION_TYPE{suffix})s, %(AMOUNT{suffix})s, "
-                    f"%(RUNNING_BALANCE{suffix})s, %(CHECK_NUMBER{suffix})s, "
-                    f"%(MEMO{suffix})s, %(ACCOUNT_ID{suffix})s)"
-                )
-
-                for col in [
-                    "TRANSACTION_ID",
-                    "POSTED_DATE",
-                    "EFFECTIVE_DATE",
-                    "DESCRIPTION",
-                    "TRANSACTION_TYPE",
-                    "AMOUNT",
-                    "RUNNING_BALANCE",
-                    "CHECK_NUMBER",
-                    "MEMO",
-                    "ACCOUNT_ID",
-                ]:
-                    params[f"{col}{suffix}"] = r[col]
-
-            values_clause = ",\n".join(values_clause_parts)
-
-            merge_sql = f"""
-                MERGE INTO BANK_TRANSACTIONS AS tgt
-                USING (
-                  SELECT
-                    column1 AS TRANSACTION_ID,
-                    column2 AS POSTED_DATE,
-                    column3 AS EFFECTIVE_DATE,
-                    column4 AS DESCRIPTION,
-                    column5 AS TRANSACTION_TYPE,
-                    column6 AS AMOUNT,
-                    column7 AS RUNNING_BALANCE,
-                    column8 AS CHECK_NUMBER,
-                    column9 AS MEMO,
-                    column10 AS ACCOUNT_ID
-                  FROM VALUES
-                  {values_clause}
-                ) AS src
-                ON tgt.TRANSACTION_ID = src.TRANSACTION_ID
-                WHEN NOT MATCHED THEN
-                  INSERT (
-                    TRANSACTION_ID,
-                    POSTED_DATE,
-                    EFFECTIVE_DATE,
-                    DESCRIPTION,
-                    TRANSACTION_TYPE,
-                    AMOUNT,
-                    RUNNING_BALANCE,
-                    CHECK_NUMBER,
-                    MEMO,
-                    ACCOUNT_ID
-                  )
-                  VALUES (
-                    src.TRANSACTION_ID,
-                    src.POSTED_DATE,
-                    src.EFFECTIVE_DATE,
-                    src.DESCRIPTION,
-                    src.TRANSACTION_TYPE,
-                    src.AMOUNT,
-                    src.RUNNING_BALANCE,
-                    src.CHECK_NUMBER,
-                    src.MEMO,
-                    src.ACCOUNT_ID
-                  )
-            """
-
-            cursor.execute(merge_sql, params)
-
-        conn.commit()
-        print(f"Inserted/merged up to {len(rows)} bank rows.")
+        cursor.execute(CREATE_STAGE_SQL)
+
+        for frame in frames:
+            if frame.empty:
+                continue
+            row_count += len(frame)
+            write_pandas(conn, frame[BANK_COLUMNS], STAGE_TABLE, quote_identifiers=False)
+
+        if row_count:
+            cursor.execute(COUNT_NEW_STAGED_SQL)
+            if cursor.fetchone()[0]:
+                cursor.execute(MERGE_FROM_STAGE_SQL)
+                # MERGE reports "number of rows inserted" as its only column
+                inserted = cursor.fetchone()[0]
+                conn.commit()
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGE_TABLE}")
     finally:
         cursor.close()
 
+    if not row_count:
+        print("No bank rows to insert.")
+    else:
+        print(f"Inserted {inserted} of {row_count} bank rows; the rest already existed.")
+    return row_count, inserted
+
 
 # ---------------------------------------------------
 # CLI
 # ---------------------------------------------------
 
-def ingest_bank_csv_file(csv_path: str, account_id: str, dry_run: bool = False) -> dict:
+def ingest_bank_csv_file(
+    csv_source: Union[str, os.PathLike, IO[bytes]],
+    account_id: str,
+    dry_run: bool = False,
+) -> dict:
     """
     Run the full ingest for a bank CSV file and return a summary dict
     that the UI can display.
+
+    csv_source may be a path or a binary file object, so uploads can be
+    parsed straight from the request stream.
     """
-    raw_rows = read_csv_rows(csv_path)
-    prepared_rows = prepare_rows_for_insert(raw_rows, account_id=account_id)
+    # Rows are parsed, prepared and merged in a single streaming pass
+    prepared_chunks = iter_prepared_chunks(csv_source, account_id=account_id)
 
     conn = get_snowflake_connection()
     try:
-        # Call your existing insert/upsert function – it probably returns None
         #upsert_rows_to_snowflake(conn, prepared_rows, dry_run=dry_run)
-        insert_rows(conn, prepared_rows, dry_run=dry_run)
+        rows_prepared, rows_inserted = insert_rows(conn, prepared_chunks, dry_run=dry_run)
     finally:
-        conn.close()
+        release_connection(conn)
 
-    # Since the insert function doesn’t tell us counts, just infer them
-    rows_prepared = len(prepared_rows)
+    # Every CSV row yields exactly one prepared row, so the counts match
     return {
-        "rows_in_file": len(raw_rows),
+        "rows_in_file": rows_prepared,
         "rows_prepared": rows_prepared,
-        "rows_inserted": 0 if dry_run else rows_prepared,
+        "rows_inserted": rows_inserted,
         "rows_updated": 0,          # adjust if you later track updates separately
         "account_id": account_id,
         "dry_run": dry_run,
@@ -345,21 +386,23 @@ def main():
     csv_path = args.csv_path
     account_id = args.account_id
 
-    if not os.path.isfile(csv_path):
-        raise FileNotFoundError(f"Bank CSV file not found: {csv_path}")
+    # Open directly rather than stat-ing first; a missing file fails here,
+    # before any Snowflake connection is made
+    try:
+        csv_file = open(csv_path, "rb")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Bank CSV file not found: {csv_path}") from None
 
     print(f"Reading BANK CSV from {csv_path} ...")
-    raw_rows = read_csv_rows(csv_path)
-    print(f"Read {len(raw_rows)} bank rows from CSV.")
-
-    prepared_rows = prepare_rows_for_insert(raw_rows, account_id=account_id)
-    print(f"Prepared {len(prepared_rows)} bank rows for insert.")
+    with csv_file:
+        prepared_chunks = iter_prepared_chunks(csv_file, account_id=account_id)
 
-    conn = get_snowflake_connection()
-    try:
-        insert_rows(conn, prepared_rows, dry_run=args.dry_run)
-    finally:
-        conn.close()
+        conn = get_snowflake_connection()
+        try:
+            row_count, _ = insert_rows(conn, prepared_chunks, dry_run=args.dry_run)
+        finally:
+            release_connection(conn)
+    print(f"Read and prepared {row_count} bank rows from CSV.")
 
 
 if __name__ == "__main__":
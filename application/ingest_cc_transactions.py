@@ -1,13 +1,19 @@
 import argparse
-import csv
+import hashlib
 import os
 import uuid
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+from datetime import date, datetime
+from functools import lru_cache
+from typing import IO, Iterable, Iterator, Optional, List, Union
 from pathlib import Path
 
-import snowflake.connector
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
+from snowflake.connector.pandas_tools import write_pandas
+
+from csv_stream import header_field_map, iter_csv_batches
+from db import get_snowflake_connection, release_connection
 
 # ---------------------------------------------------
 # Load .env from the directory of this script
@@ -23,25 +29,42 @@ else:
     print(f"WARNING: .env file not found at {ENV_PATH}")
 
 
-def get_snowflake_connection():
-    """Create and return a Snowflake connection using env vars."""
-    conn_params = {
-        "user": os.getenv("SF_USER"),
-        "password": os.getenv("SF_PASSWORD"),
-        "account": os.getenv("SF_ACCOUNT"),
-        "warehouse": os.getenv("SF_WAREHOUSE"),
-        "database": os.getenv("SF_DATABASE"),
-        "schema": os.getenv("SF_SCHEMA"),
-    }
-    role = os.getenv("SF_ROLE")
-    if role:
-        conn_params["role"] = role
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y")
 
-    missing = [k for k, v in conn_params.items() if v is None]
-    if missing:
-        raise RuntimeError(f"Missing Snowflake env vars: {', '.join(missing)}")
 
-    return snowflake.connector.connect(**conn_params)
+@lru_cache(maxsize=4096)
+def _parse_date_str(value: str) -> str:
+    """
+    Parse a stripped, non-empty date string to ISO format.
+
+    Zero-padded YYYY-MM-DD and MM/DD/YYYY values, which is what the card
+    exports use, are sliced directly; anything else falls back to strptime.
+    Results are cached since an export only holds a few hundred distinct dates.
+    """
+    if len(value) == 10:
+        if value[4] == "-" == value[7]:
+            year, month, day = value[:4], value[5:7], value[8:]
+        elif value[2] == "/" == value[5]:
+            month, day, year = value[:2], value[3:5], value[6:]
+        else:
+            year = month = day = ""
+        digits = year + month + day
+        if digits.isascii() and digits.isdigit():
+            try:
+                return date(int(year), int(month), int(day)).isoformat()
+            except ValueError:
+                pass
+
+    # Adjust formats here if your bank uses something else.
+    for fmt in DATE_FORMATS:
+        try:
+            d = datetime.strptime(value, fmt).date()
+            return d.isoformat()
+        except ValueError:
+            continue
+
+    # If it doesn't match any known format, raise or log
+    raise ValueError(f"Unrecognized date format: {value!r}")
 
 
 def parse_date(value: str) -> Optional[str]:
@@ -53,38 +76,174 @@ def parse_date(value: str) -> Optional[str]:
     if not value:
         return None
 
-    # Adjust formats here if your bank uses something else.
-    # Common formats: "%m/%d/%Y", "%Y-%m-%d"
-    for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
-        try:
-            d = datetime.strptime(value, fmt).date()
-            return d.isoformat()
-        except ValueError:
-            continue
+    return _parse_date_str(value)
+
+
+# SHA-1 state after absorbing the uuid5 namespace; each ID copies it and only
+# hashes the key, which is exactly what uuid.uuid5(NAMESPACE_DNS, key) does
+_UUID5_DNS_SHA1 = hashlib.sha1(uuid.NAMESPACE_DNS.bytes, usedforsecurity=False)
+
+
+def _uuid5_dns(key: str) -> str:
+    h = _UUID5_DNS_SHA1.copy()
+    h.update(key.encode("utf-8"))
+    return str(uuid.UUID(bytes=h.digest()[:16], version=5))
+
+
+def generate_transaction_ids(
+    tx_dates: pd.Series,
+    post_dates: pd.Series,
+    descriptions: pd.Series,
+    amounts: pd.Series,
+    account_id: str,
+) -> List[str]:
+    """
+    Generate deterministic UUIDs based on key fields, one per row.
+    This helps avoid duplicate inserts if we re-ingest the same CSV, so the
+    key string must stay identical to what earlier imports produced.
+    """
+    keys = (
+        tx_dates.fillna("")
+        + "|" + post_dates.fillna("")
+        + "|" + descriptions.str.upper()
+        # A zero amount has always contributed an empty key part
+        + "|" + pd.Series([str(a) if a else "" for a in amounts.tolist()], index=amounts.index)
+        + "|" + account_id.strip()
+    )
+    return [_uuid5_dns(key) for key in keys.tolist()]
+
+
+# Bytes per parsed block; each block becomes one DataFrame chunk
+CSV_BLOCK_SIZE = 1 << 20
 
-    # If it doesn't match any known format, raise or log
-    raise ValueError(f"Unrecognized date format: {value!r}")
 
+def _negated_amounts(values: pd.Series) -> pd.Series:
+    """
+    Strip thousands separators and flip the sign of every numeric amount.
 
-def generate_transaction_id(row: Dict[str, Any], account_id: str) -> str:
+    Values that don't parse are passed through (cleaned) so
+    prepare_rows_for_insert reports them.
     """
-    Generate a deterministic UUID based on key fields.
-    This helps avoid duplicate inserts if we re-ingest the same CSV.
+    cleaned = values.str.replace(",", "", regex=False).str.strip()
+    numeric = pd.to_numeric(cleaned, errors="coerce")
+    return (-numeric).astype(object).where(numeric.notna(), cleaned)
+
+
+# Header signatures that identify each supported layout, and the columns
+# each layout must provide. Headers are compared lower-cased and stripped.
+APPLE_SIGNATURE = frozenset({"transaction date", "clearing date", "amount (usd)"})
+APPLE_REQUIRED = APPLE_SIGNATURE | {"description", "category", "type"}
+SIMPLE_SIGNATURE = frozenset({"date", "amount"})
+SIMPLE_REQUIRED = SIMPLE_SIGNATURE | {"description"}
+STANDARD_COLUMNS = (
+    "transaction date",
+    "post date",
+    "description",
+    "category",
+    "type",
+    "amount",
+    "memo",
+)
+STANDARD_REQUIRED = frozenset(STANDARD_COLUMNS)
+
+
+def detect_csv_layout(columns: frozenset) -> Optional[str]:
     """
-    key_parts = [
-        row.get("transaction date", "") or "",
-        row.get("post date", "") or "",
-        (row.get("description", "") or "").upper(),
-        str(row.get("amount", "") or "").strip(),
-        account_id.strip(),
-    ]
-    key = "|".join(key_parts)
-    return str(uuid.uuid5(uuid.NAMESPACE_DNS, key))
-
-
-def read_csv_rows(csv_path: str) -> List[Dict[str, Any]]:
+    Identify the CSV layout from its set of normalized header names.
+
+    Returns "apple", "simple" or "standard", or None if the header matches
+    none of them.
     """
-    Read the CSV file and return a list of dict rows.
+    # Apple: has Transaction Date + Clearing Date + Amount (USD)
+    if APPLE_SIGNATURE <= columns:
+        return "apple"
+    # Simple / Amex style: Date + Amount, but NO "transaction date" header
+    if SIMPLE_SIGNATURE <= columns and "transaction date" not in columns:
+        return "simple"
+    # Standard format: our original header layout
+    if STANDARD_REQUIRED <= columns:
+        return "standard"
+    return None
+
+
+def _require_columns(columns: frozenset, required: frozenset, layout: str) -> None:
+    missing = required - columns
+    if missing:
+        raise RuntimeError(
+            f"CSV ({layout} format) is missing required column(s): {', '.join(sorted(missing))}"
+        )
+
+
+# Each normalizer takes one chunk of raw string columns, named by their
+# lower-cased header, and returns the normalized columns.
+
+def _optional_column(raw: pd.DataFrame, name: str) -> pd.Series:
+    if name in raw:
+        return raw[name]
+    return pd.Series("", index=raw.index, dtype=object)
+
+
+def _normalize_apple(raw: pd.DataFrame) -> pd.DataFrame:
+    merchant = _optional_column(raw, "merchant").str.strip()
+    purchased_by = _optional_column(raw, "purchased by").str.strip()
+    both = (merchant != "") & (purchased_by != "")
+    memo = (merchant + purchased_by).where(~both, merchant + " | " + purchased_by)
+
+    return pd.DataFrame({
+        "transaction date": raw["transaction date"],
+        "post date": raw["clearing date"],
+        "description": raw["description"],
+        "category": raw["category"],
+        "type": raw["type"].str.strip(),
+        # Flip sign so charges NEGATIVE, payments POSITIVE
+        "amount": _negated_amounts(raw["amount (usd)"]),
+        "memo": memo,
+    })
+
+
+def _normalize_simple(raw: pd.DataFrame) -> pd.DataFrame:
+    # Amex export: charges POSITIVE, payments NEGATIVE.
+    # Normalize: charges NEGATIVE, payments POSITIVE
+    amounts = _negated_amounts(raw["amount"])
+    numeric = pd.to_numeric(amounts, errors="coerce")
+    txn_type = np.select([numeric < 0, numeric > 0], ["CHARGE", "PAYMENT"], "")
+
+    return pd.DataFrame({
+        "transaction date": raw["date"],
+        "post date": raw["date"],
+        "description": raw["description"],
+        "category": _optional_column(raw, "category"),
+        "type": txn_type,
+        "amount": amounts,
+        "memo": "",  # no extra columns in memo for Amex
+    })
+
+
+def _normalize_standard(raw: pd.DataFrame) -> pd.DataFrame:
+    # Already our layout; just fix the column order
+    return raw[list(STANDARD_COLUMNS)]
+
+
+# Layout -> (columns it must provide, columns it reads if present,
+# name used in error messages, normalizer)
+_LAYOUTS = {
+    "apple": (APPLE_REQUIRED, ("merchant", "purchased by"), "Apple", _normalize_apple),
+    "simple": (SIMPLE_REQUIRED, ("category",), "Date/Amount", _normalize_simple),
+    "standard": (STANDARD_REQUIRED, (), "standard", _normalize_standard),
+}
+
+
+def iter_csv_chunks(
+    csv_source: Union[str, os.PathLike, IO[bytes]],
+) -> Iterator[pd.DataFrame]:
+    """
+    Read the CSV file (a path or a binary file object such as an upload
+    stream) and yield DataFrames of normalized rows, one per parsed block.
+
+    Parsing uses pyarrow's multi-threaded streaming CSV reader (see
+    csv_stream.iter_csv_batches), with every column read as a string. Each
+    layout is normalized with column operations rather than per-row dicts.
+    The layout is detected once, from the header row.
 
     Supports:
       1) Original "standard" CC CSV format:
@@ -97,336 +256,240 @@ def read_csv_rows(csv_path: str) -> List[Dict[str, Any]]:
       3) Simple Date/Amount CC format (e.g. Amex):
          Date, Description, Amount, Category, (plus other unused cols)
 
-    Internally we normalize to keys:
+    Internally we normalize to columns:
       "transaction date", "post date", "description",
       "category", "type", "amount", "memo"
     """
-    with open(csv_path, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        if not reader.fieldnames:
-            raise RuntimeError("CSV has no header row.")
+    # Normalizer, and the positions and names of the columns it reads,
+    # resolved once from the header
+    normalize = None
+    for header, batch in iter_csv_batches(csv_source, CSV_BLOCK_SIZE):
+        if normalize is None:
+            field_map = header_field_map(header)
+            columns = frozenset(field_map)
+            layout = detect_csv_layout(columns)
+            if layout is None:
+                raise RuntimeError(f"Unrecognized CSV layout. Headers: {header}")
+            required, optional, label, normalize = _LAYOUTS[layout]
+            _require_columns(columns, required, label)
+            names = sorted(required) + [name for name in optional if name in columns]
+            indices = [field_map[name] for name in names]
+        if not batch.num_rows:
+            continue
 
-        # Map lower-cased header -> original header name
-        field_map = {name.lower().strip(): name for name in reader.fieldnames}
+        # Only the needed columns are converted, already named
+        yield normalize(batch.select(indices).rename_columns(names).to_pandas())
 
-        # --- Format detection ---
 
-        # Apple: has Transaction Date + Clearing Date + Amount (USD)
-        is_apple = (
-            "transaction date" in field_map
-            and "clearing date" in field_map
-            and "amount (usd)" in field_map
-        )
+def _parse_dates(values: pd.Series) -> pd.Series:
+    """parse_date over a column, parsing each distinct value once."""
+    parsed = {value: parse_date(value) for value in values.unique().tolist()}
+    return values.map(parsed)
 
-        # Simple / Amex style: Date + Amount, but NO "transaction date" header
-        is_simple_date_amount = (
-            "date" in field_map
-            and "amount" in field_map
-            and "transaction date" not in field_map
-        )
 
-        # Standard format: our original header layout
-        has_standard_columns = all(
-            col in field_map
-            for col in [
-                "transaction date",
-                "post date",
-                "description",
-                "category",
-                "type",
-                "amount",
-                "memo",
-            ]
+def _parse_amounts(values: pd.Series) -> pd.Series:
+    """float() over a column of amount strings, in one numpy cast."""
+    try:
+        return pd.Series(
+            values.to_numpy(dtype=object).astype("float64"), index=values.index
         )
+    except (TypeError, ValueError):
+        # Find the offending value for the error message
+        for value in values.tolist():
+            try:
+                float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid amount value: {value!r}")
+        raise
 
-        rows: List[Dict[str, Any]] = []
-
-        # ---------- APPLE CARD ----------
-        if is_apple:
-            for col in [
-                "transaction date",
-                "clearing date",
-                "description",
-                "category",
-                "type",
-                "amount (usd)",
-            ]:
-                if col not in field_map:
-                    raise RuntimeError(
-                        f"CSV (Apple format) is missing required column: {col}"
-                    )
-
-            for raw_row in reader:
-                merchant = (
-                    raw_row[field_map["merchant"]].strip()
-                    if "merchant" in field_map and raw_row.get(field_map["merchant"])
-                    else ""
-                )
-                purchased_by = (
-                    raw_row[field_map["purchased by"]].strip()
-                    if "purchased by" in field_map and raw_row.get(field_map["purchased by"])
-                    else ""
-                )
-
-                memo_parts = [p for p in [merchant, purchased_by] if p]
-                memo = " | ".join(memo_parts) if memo_parts else ""
-
-                # Flip sign so charges NEGATIVE, payments POSITIVE
-                amount_raw = raw_row[field_map["amount (usd)"]].replace(",", "").strip()
-                type_value = raw_row[field_map["type"]].strip() if "type" in field_map else ""
-                normalized_amount = amount_raw
-                try:
-                    amt = float(amount_raw)
-                    normalized_amount = str(-amt)
-                except ValueError:
-                    pass
-
-                row = {
-                    "transaction date": raw_row[field_map["transaction date"]],
-                    "post date": raw_row[field_map["clearing date"]],
-                    "description": raw_row[field_map["description"]],
-                    "category": raw_row[field_map["category"]],
-                    "type": type_value,
-                    "amount": normalized_amount,
-                    "memo": memo,
-                }
-                rows.append(row)
-
-        # ---------- AMEX / SIMPLE DATE+AMOUNT FORMAT ----------
-        elif is_simple_date_amount:
-            for col in ["date", "description", "amount"]:
-                if col not in field_map:
-                    raise RuntimeError(
-                        f"CSV (Date/Amount format) is missing required column: {col}"
-                    )
-
-            for raw_row in reader:
-                raw_amt = raw_row[field_map["amount"]].replace(",", "").strip()
-                txn_type = ""
-                normalized_amount = raw_amt
-
-                try:
-                    amt = float(raw_amt)
-                    # Amex export: charges POSITIVE, payments NEGATIVE
-                    if amt > 0:
-                        txn_type = "CHARGE"
-                    elif amt < 0:
-                        txn_type = "PAYMENT"
-
-                    # Normalize: charges NEGATIVE, payments POSITIVE
-                    normalized_amount = str(-amt)
-                except ValueError:
-                    pass
-
-                row = {
-                    "transaction date": raw_row[field_map["date"]],
-                    "post date": raw_row[field_map["date"]],
-                    "description": raw_row[field_map["description"]],
-                    "category": raw_row[field_map["category"]] if "category" in field_map else "",
-                    "type": txn_type,
-                    "amount": normalized_amount,
-                    "memo": "",  # no extra columns in memo for Amex
-                }
-                rows.append(row)
-
-        # ---------- ORIGINAL STANDARD FORMAT ----------
-        elif has_standard_columns:
-            for raw_row in reader:
-                row = {
-                    "transaction date": raw_row[field_map["transaction date"]],
-                    "post date": raw_row[field_map["post date"]],
-                    "description": raw_row[field_map["description"]],
-                    "category": raw_row[field_map["category"]],
-                    "type": raw_row[field_map["type"]],
-                    "amount": raw_row[field_map["amount"]],
-                    "memo": raw_row[field_map["memo"]],
-                }
-                rows.append(row)
-
-        else:
-            raise RuntimeError(
-                f"Unrecognized CSV layout. Headers: {reader.fieldnames}"
-            )
 
-    return rows
+def _strip_if_set(values: pd.Series) -> pd.Series:
+    """Strip set values, turning missing or empty ones into None."""
+    filled = values.fillna("")
+    return filled.str.strip().where(filled != "", None)
 
 
-def prepare_rows_for_insert(csv_rows: List[Dict[str, Any]], account_id: str) -> List[Dict[str, Any]]:
+def prepare_rows_for_insert(raw: pd.DataFrame, account_id: str) -> pd.DataFrame:
     """
-    Convert raw CSV rows into a structure ready for Snowflake insert.
-    """
-    prepared = []
-    for r in csv_rows:
-        tx_date_iso = parse_date(r["transaction date"])
-        post_date_iso = parse_date(r["post date"])
-        description = r["description"].strip()
-        category = r["category"].strip() if r["category"] else None
-        tx_type = r["type"].strip() if r["type"] else None
-
-        try:
-            amount = float(r["amount"])
-        except ValueError:
-            raise ValueError(f"Invalid amount value: {r['amount']!r}")
-
-        memo = r["memo"].strip() if r["memo"] else None
-
-        tx_id = generate_transaction_id(
-            {
-                "transaction date": tx_date_iso or "",
-                "post date": post_date_iso or "",
-                "description": description,
-                "amount": amount,
-            },
-            account_id=account_id,
-        )
-
-        prepared.append(
-            {
-                "TRANSACTION_ID": tx_id,
-                "TRANSACTION_DATE": tx_date_iso,
-                "POST_DATE": post_date_iso,
-                "DESCRIPTION": description,
-                "CATEGORY": category,
-                "TYPE": tx_type,
-                "AMOUNT": amount,
-                "MEMO": memo,
-                "ACCOUNT_ID": account_id,
-            }
-        )
+    Convert a chunk of normalized CSV rows from iter_csv_chunks into a
+    DataFrame of CC_COLUMNS ready for Snowflake insert.
 
-    return prepared
+    The columns are transformed as a whole with pandas rather than row by row,
+    and the result is handed to write_pandas as is.
+    """
+    if raw.empty:
+        return pd.DataFrame(columns=CC_COLUMNS)
+
+    tx_dates = _parse_dates(raw["transaction date"])
+    post_dates = _parse_dates(raw["post date"])
+    descriptions = raw["description"].fillna("").str.strip()
+    amounts = _parse_amounts(raw["amount"])
+
+    return pd.DataFrame({
+        "TRANSACTION_ID": generate_transaction_ids(
+            tx_dates, post_dates, descriptions, amounts, account_id
+        ),
+        "TRANSACTION_DATE": tx_dates,
+        "POST_DATE": post_dates,
+        "DESCRIPTION": descriptions,
+        "CATEGORY": _strip_if_set(raw["category"]),
+        "TYPE": _strip_if_set(raw["type"]),
+        "AMOUNT": amounts,
+        "MEMO": _strip_if_set(raw["memo"]),
+        "ACCOUNT_ID": account_id,
+    }, index=raw.index)
+
+
+def iter_prepared_chunks(
+    csv_source: Union[str, os.PathLike, IO[bytes]],
+    account_id: str,
+) -> Iterator[pd.DataFrame]:
+    """Stream the CSV as insert-ready DataFrame chunks."""
+    for raw in iter_csv_chunks(csv_source):
+        yield prepare_rows_for_insert(raw, account_id)
+
+
+CC_COLUMNS = [
+    "TRANSACTION_ID",
+    "TRANSACTION_DATE",
+    "POST_DATE",
+    "DESCRIPTION",
+    "CATEGORY",
+    "TYPE",
+    "AMOUNT",
+    "MEMO",
+    "ACCOUNT_ID",
+]
+
+STAGE_TABLE = "CC_TRANSACTIONS_STG"
+
+# write_pandas splits the frame into Parquet files of UPLOAD_CHUNK_ROWS rows,
+# PUTs them with one wildcard upload across UPLOAD_THREADS threads, and loads
+# them all with a single COPY INTO
+UPLOAD_CHUNK_ROWS = int(os.getenv("CC_UPLOAD_CHUNK_ROWS", "100000"))
+UPLOAD_THREADS = 8
+# Row groups of ~8k rows keep each column chunk in the 256KB-1MB range
+PARQUET_ROW_GROUP_ROWS = 8192
+
+CREATE_STAGE_SQL = f"CREATE OR REPLACE TEMPORARY TABLE {STAGE_TABLE} LIKE CC_TRANSACTIONS"
+
+MERGE_FROM_STAGE_SQL = f"""
+    MERGE INTO CC_TRANSACTIONS AS tgt
+    USING {STAGE_TABLE} AS src
+    ON tgt.TRANSACTION_ID = src.TRANSACTION_ID
+    WHEN NOT MATCHED THEN
+      INSERT ({", ".join(CC_COLUMNS)})
+      VALUES ({", ".join(f"src.{col}" for col in CC_COLUMNS)})
+"""
+
+
+def _write_stage(conn, frames: List[pd.DataFrame], chunk_size: int) -> None:
+    """Upload buffered frames into the stage table with one write_pandas call."""
+    write_pandas(
+        conn,
+        pd.concat(frames, ignore_index=True)[CC_COLUMNS],
+        STAGE_TABLE,
+        quote_identifiers=False,
+        chunk_size=chunk_size,
+        compression="snappy",
+        parallel=UPLOAD_THREADS,
+        bulk_upload_chunks=True,
+        use_logical_type=True,
+        use_vectorized_scanner=True,
+        row_group_size=PARQUET_ROW_GROUP_ROWS,
+    )
 
 
-def insert_rows(conn, rows: List[Dict[str, Any]], dry_run: bool = False):
+def insert_rows(
+    conn,
+    frames: Iterable[pd.DataFrame],
+    dry_run: bool = False,
+    chunk_size: Optional[int] = None,
+) -> int:
     """
     Insert rows into CC_TRANSACTIONS using MERGE on TRANSACTION_ID.
     Re-ingesting the same file for the same account will not create dups.
-    """
-    if not rows:
-        print("No credit card rows to insert.")
-        return
 
+    DataFrames of CC_COLUMNS are buffered until there is one Parquet file
+    of chunk_size rows (default UPLOAD_CHUNK_ROWS) per upload thread, then
+    bulk-loaded into a temporary stage table with write_pandas (Parquet
+    upload + COPY INTO). Once every frame is staged they are merged into
+    CC_TRANSACTIONS with a single MERGE statement, so memory is bounded by
+    the buffer rather than the file.
+
+    Returns the number of rows processed.
+    """
     if dry_run:
-        print(f"[DRY RUN] Would insert/merge up to {len(rows)} credit card rows.")
-        return
+        row_count = sum(len(frame) for frame in frames)
+        print(f"[DRY RUN] Would insert/merge up to {row_count} credit card rows.")
+        return row_count
 
+    chunk_size = chunk_size or UPLOAD_CHUNK_ROWS
+    flush_rows = chunk_size * UPLOAD_THREADS
+
+    row_count = 0
+    buffered: List[pd.DataFrame] = []
+    buffered_rows = 0
     cursor = conn.cursor()
     try:
-        chunk_size = 200
-        for i in range(0, len(rows), chunk_size):
-            chunk = rows[i : i + chunk_size]
-
-            values_clause_parts: List[str] = []
-            params: Dict[str, Any] = {}
-
-            for idx, r in enumerate(chunk):
-                suffix = f"_{idx}"
-                values_clause_parts.append(
-                    "("
-                    + ", ".join(
-                        [
-                            f"%({col}{suffix})s"
-                            for col in [
-                                "TRANSACTION_ID",
-                                "TRANSACTION_DATE",
-                                "POST_DATE",
-                                "DESCRIPTION",
-                                "CATEGORY",
-                                "TYPE",
-                                "AMOUNT",
-                                "MEMO",
-                                "ACCOUNT_ID",
-                            ]
-                        ]
-                    )
-                    + ")"
-                )
-
-                for col in [
-                    "TRANSACTION_ID",
-                    "TRANSACTION_DATE",
-                    "POST_DATE",
-                    "DESCRIPTION",
-                    "CATEGORY",
-                    "TYPE",
-                    "AMOUNT",
-                    "MEMO",
-                    "ACCOUNT_ID",
-                ]:
-                    params[f"{col}{suffix}"] = r[col]
-
-            values_clause = ",\n".join(values_clause_parts)
-
-            merge_sql = f"""
-                MERGE INTO CC_TRANSACTIONS AS tgt
-                USING (
-                  SELECT
-                    column1 AS TRANSACTION_ID,
-                    column2 AS TRANSACTION_DATE,
-                    column3 AS POST_DATE,
-                    column4 AS DESCRIPTION,
-                    column5 AS CATEGORY,
-                    column6 AS TYPE,
-                    column7 AS AMOUNT,
-                    column8 AS MEMO,
-                    column9 AS ACCOUNT_ID
-                  FROM VALUES
-                  {values_clause}
-                ) AS src
-                ON tgt.TRANSACTION_ID = src.TRANSACTION_ID
-                WHEN NOT MATCHED THEN
-                  INSERT (
-                    TRANSACTION_ID,
-                    TRANSACTION_DATE,
-                    POST_DATE,
-                    DESCRIPTION,
-                    CATEGORY,
-                    TYPE,
-                    AMOUNT,
-                    MEMO,
-                    ACCOUNT_ID
-                  )
-                  VALUES (
-                    src.TRANSACTION_ID,
-                    src.TRANSACTION_DATE,
-                    src.POST_DATE,
-                    src.DESCRIPTION,
-                    src.CATEGORY,
-                    src.TYPE,
-                    src.AMOUNT,
-                    src.MEMO,
-                    src.ACCOUNT_ID
-                  )
-            """
-
-            cursor.execute(merge_sql, params)
-
-        conn.commit()
-        print(f"Inserted/merged up to {len(rows)} credit card rows.")
+        cursor.execute(CREATE_STAGE_SQL)
+
+        for frame in frames:
+            if frame.empty:
+                continue
+            row_count += len(frame)
+            buffered.append(frame)
+            buffered_rows += len(frame)
+            if buffered_rows >= flush_rows:
+                _write_stage(conn, buffered, chunk_size)
+                buffered = []
+                buffered_rows = 0
+        if buffered:
+            _write_stage(conn, buffered, chunk_size)
+
+        if row_count:
+            cursor.execute(MERGE_FROM_STAGE_SQL)
+            conn.commit()
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGE_TABLE}")
     finally:
         cursor.close()
 
-def ingest_csv_file(csv_path: str, account_id: str, dry_run: bool = False) -> dict:
+    if not row_count:
+        print("No credit card rows to insert.")
+    else:
+        print(f"Inserted/merged up to {row_count} credit card rows.")
+    return row_count
+
+def ingest_csv_file(
+    csv_source: Union[str, os.PathLike, IO[bytes]],
+    account_id: str,
+    dry_run: bool = False,
+) -> dict:
     """
     Convenience helper so the Flask app can call this directly.
 
+    csv_source may be a path or a binary file object, so uploads can be
+    parsed straight from the request stream.
+
     Returns a small summary dict that the UI can display.
     """
-    raw_rows = read_csv_rows(csv_path)
-    prepared_rows = prepare_rows_for_insert(raw_rows, account_id=account_id)
+    # Rows are parsed, prepared and uploaded in a single streaming pass
+    prepared_chunks = iter_prepared_chunks(csv_source, account_id=account_id)
 
+    # Pooled connection, so repeated imports skip the login handshake
     conn = get_snowflake_connection()
     try:
-        insert_rows(conn, prepared_rows, dry_run=dry_run)
+        rows_prepared = insert_rows(conn, prepared_chunks, dry_run=dry_run)
     finally:
-        conn.close()
+        release_connection(conn)
 
+    # Every CSV row yields exactly one prepared row, so the counts match
     return {
-        "rows_in_file": len(raw_rows),
-        "rows_prepared": len(prepared_rows),
+        "rows_in_file": rows_prepared,
+        "rows_prepared": rows_prepared,
         # we can't easily distinguish skips vs inserts without changing insert_rows,
         # so treat everything as "attempted".
-        "rows_attempted_insert": 0 if dry_run else len(prepared_rows),
+        "rows_attempted_insert": 0 if dry_run else rows_prepared,
         "account_id": account_id,
         "dry_run": dry_run,
     }
@@ -451,21 +514,22 @@ def main():
     csv_path = args.csv_path
     account_id = args.account_id
 
-    if not os.path.isfile(csv_path):
-        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    # Open directly rather than stat-ing first; a missing file fails here
+    try:
+        csv_file = open(csv_path, "rb")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file not found: {csv_path}") from None
 
     print(f"Reading CSV from {csv_path} ...")
-    raw_rows = read_csv_rows(csv_path)
-    print(f"Read {len(raw_rows)} rows from CSV.")
-
-    prepared_rows = prepare_rows_for_insert(raw_rows, account_id=account_id)
-    print(f"Prepared {len(prepared_rows)} rows for insert.")
+    with csv_file:
+        prepared_chunks = iter_prepared_chunks(csv_file, account_id=account_id)
 
-    conn = get_snowflake_connection()
-    try:
-        insert_rows(conn, prepared_rows, dry_run=args.dry_run)
-    finally:
-        conn.close()
+        conn = get_snowflake_connection()
+        try:
+            row_count = insert_rows(conn, prepared_chunks, dry_run=args.dry_run)
+        finally:
+            release_connection(conn)
+    print(f"Read and prepared {row_count} rows from CSV.")
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from operator import itemgetter
 import pandas as pd
 from typing import List
 from queries import query_cc_transactions_snowflake, query_bank_transactions_snowflake
@@ -36,27 +37,37 @@ def build_correlated_payments(
     cc_df["TRANSACTION_DATE"] = pd.to_datetime(cc_df["TRANSACTION_DATE"])
     bank_df["TRANSACTION_DATE"] = pd.to_datetime(bank_df["TRANSACTION_DATE"])
 
-    cc_payments = cc_df[cc_df["AMOUNT"] > 0].copy()
+    cc_payments = cc_df[(cc_df["AMOUNT"] > 0) & cc_df["TRANSACTION_DATE"].notna()].copy()
     if cc_payments.empty:
         return []
 
-    bank_out = bank_df[bank_df["AMOUNT"] < 0].copy()
-    bank_out["AMOUNT_ABS"] = bank_out["AMOUNT"].abs()
-    cc_payments["AMOUNT_ABS"] = cc_payments["AMOUNT"].abs()
-
-    merged = cc_payments.merge(
-        bank_out,
-        how="inner",
-        left_on="AMOUNT_ABS",
-        right_on="AMOUNT_ABS",
+    bank_out = bank_df[(bank_df["AMOUNT"] < 0) & bank_df["TRANSACTION_DATE"].notna()].copy()
+    bank_out["TRANSACTION_DATE_BANK"] = bank_out["TRANSACTION_DATE"]
+
+    # The filters above fix each side's sign, so the match key needs no abs()
+    cc_payments["AMOUNT_ABS"] = cc_payments["AMOUNT"]
+    bank_out["AMOUNT_ABS"] = -bank_out["AMOUNT"]
+
+    # Pair each card payment with the nearest-dated bank outflow of the same
+    # amount within the tolerance, in one sorted pass rather than a join on
+    # amount (which fans out on repeated round amounts) plus a date filter
+    merged = pd.merge_asof(
+        cc_payments.sort_values("TRANSACTION_DATE"),
+        bank_out.sort_values("TRANSACTION_DATE"),
+        on="TRANSACTION_DATE",
+        by="AMOUNT_ABS",
+        tolerance=pd.Timedelta(days=date_tolerance_days),
+        direction="nearest",
         suffixes=("_CC", "_BANK"),
     )
+    merged = merged.dropna(subset=["TRANSACTION_DATE_BANK"]).rename(
+        columns={"TRANSACTION_DATE": "TRANSACTION_DATE_CC"}
+    )
 
     if merged.empty:
         return []
 
     merged["DATE_DIFF"] = (merged["TRANSACTION_DATE_BANK"] - merged["TRANSACTION_DATE_CC"]).dt.days.abs()
-    merged = merged[merged["DATE_DIFF"] <= date_tolerance_days]
 
     start_ts = pd.to_datetime(start_date)
     end_ts = pd.to_datetime(end_date)
@@ -65,26 +76,40 @@ def build_correlated_payments(
         (merged["TRANSACTION_DATE_BANK"].between(start_ts, end_ts))
     ]
 
-    results = []
-    for _, row in merged.iterrows():
-        results.append(
-            {
-                "amount": float(row["AMOUNT_CC"]),
-                "cc_date": row["TRANSACTION_DATE_CC"].date().isoformat(),
-                "cc_desc": row["DESCRIPTION_CC"],
-                "bank_date": row["TRANSACTION_DATE_BANK"].date().isoformat(),
-                "bank_desc": row["DESCRIPTION_BANK"],
-                "bank_type": row["TYPE_BANK"],
-                "date_diff": int(row["DATE_DIFF"]),
-            }
+    # Pull whole columns out once instead of building a Series per row
+    results = [
+        {
+            "amount": amount,
+            "cc_date": cc_date,
+            "cc_desc": cc_desc,
+            "bank_date": bank_date,
+            "bank_desc": bank_desc,
+            "bank_type": bank_type,
+            "date_diff": date_diff,
+        }
+        for amount, cc_date, cc_desc, bank_date, bank_desc, bank_type, date_diff in zip(
+            merged["AMOUNT_CC"].astype(float).tolist(),
+            merged["TRANSACTION_DATE_CC"].dt.strftime("%Y-%m-%d").tolist(),
+            merged["DESCRIPTION_CC"].tolist(),
+            merged["TRANSACTION_DATE_BANK"].dt.strftime("%Y-%m-%d").tolist(),
+            merged["DESCRIPTION_BANK"].tolist(),
+            merged["TYPE_BANK"].tolist(),
+            merged["DATE_DIFF"].astype(int).tolist(),
         )
+    ]
 
-    results.sort(key=lambda r: r["cc_date"], reverse=True)
+    results.sort(key=itemgetter("cc_date"), reverse=True)
     return results
 
 
-def compute_dashboard_metrics(df: pd.DataFrame, start_str: str, end_str: str):
-    if df.empty:
+def compute_dashboard_metrics(summary: pd.DataFrame, start_str: str, end_str: str):
+    """
+    Format dashboard cards and chart series from a per (day, category)
+    summary as returned by query_cc_summary_snowflake /
+    query_bank_summary_snowflake. The heavy aggregation already ran in
+    Snowflake, so this only rolls up a few hundred rows.
+    """
+    if summary.empty:
         return {
             "num_tx": 0,
             "total_spent": 0.0,
@@ -95,67 +120,53 @@ def compute_dashboard_metrics(df: pd.DataFrame, start_str: str, end_str: str):
             "daily_spend": [],
             "cat_labels": [],
             "cat_values": [],
+            "spend_cat_labels": [],
+            "spend_cat_values": [],
+            "income_cat_labels": [],
+            "income_cat_values": [],
         }
 
-    num_tx = len(df)
-    total_spent = float(df.loc[df["AMOUNT"] < 0, "AMOUNT"].sum())
-    total_received = float(df.loc[df["AMOUNT"] > 0, "AMOUNT"].sum())
+    num_tx = int(summary["NUM_TX"].sum())
+    total_spent = float(summary["SPENT"].sum())
+    total_received = float(summary["RECEIVED"].sum())
     net = total_received + total_spent
 
-    daily = df.copy()
-    daily["TRANSACTION_DATE"] = pd.to_datetime(daily["TRANSACTION_DATE"])
-    daily_out = (
-        daily[daily["AMOUNT"] < 0]
-        .groupby("TRANSACTION_DATE")["AMOUNT"]
-        .sum()
-        .abs()
-        .reset_index()
-        .sort_values("TRANSACTION_DATE")
-    )
+    # SPENT is never positive, so negating gives the spend magnitude
+    daily_out = -summary.groupby("TRANSACTION_DATE")["SPENT"].sum()
+    daily_out = daily_out[daily_out > 0].sort_index()
 
     if not daily_out.empty:
-        daily_labels = daily_out["TRANSACTION_DATE"].dt.strftime("%Y-%m-%d").tolist()
-        daily_spend = daily_out["AMOUNT"].round(2).tolist()
+        daily_labels = pd.to_datetime(daily_out.index).strftime("%Y-%m-%d").tolist()
+        daily_spend = daily_out.round(2).tolist()
         days_in_range = (pd.to_datetime(end_str) - pd.to_datetime(start_str)).days or 1
-        avg_daily_spend = abs(total_spent) / days_in_range
+        avg_daily_spend = -total_spent / days_in_range
     else:
         daily_labels = []
         daily_spend = []
         avg_daily_spend = 0.0
 
-    spend = (
-        df[df["AMOUNT"] < 0]
-        .groupby("CATEGORY", dropna=False)["AMOUNT"]
-        .sum()
-        .abs()
-        .sort_values(ascending=False)
-        .head(7)
-        .reset_index()
-    )
+    # One category pass for both spending and income totals
+    by_category = summary.groupby("CATEGORY", dropna=False, sort=False)[["SPENT", "RECEIVED"]].sum()
+
+    spend = -by_category["SPENT"]
+    spend = spend[spend > 0].nlargest(7)
 
     if not spend.empty:
-        spend_cat_labels = spend["CATEGORY"].fillna("Uncategorized").tolist()
-        spend_cat_values = spend["AMOUNT"].round(2).tolist()
+        spend_cat_labels = spend.index.fillna("Uncategorized").tolist()
+        spend_cat_values = spend.round(2).tolist()
     else:
         spend_cat_labels = []
         spend_cat_values = []
 
-    income = (
-        df[df["AMOUNT"] > 0]
-        .groupby("CATEGORY", dropna=False)["AMOUNT"]
-        .sum()
-        .sort_values(ascending=False)
-        .abs()
-        .head(7)
-        .reset_index()
-    )
+    income = by_category["RECEIVED"]
+    income = income[income > 0].nlargest(7)
 
     cat_labels = spend_cat_labels
     cat_values = spend_cat_values
 
     if not income.empty:
-        income_cat_labels = income["CATEGORY"].fillna("Uncategorized").tolist()
-        income_cat_values = income["AMOUNT"].round(2).tolist()
+        income_cat_labels = income.index.fillna("Uncategorized").tolist()
+        income_cat_values = income.round(2).tolist()
     else:
         income_cat_labels = []
         income_cat_values = []
@@ -174,4 +185,4 @@ def compute_dashboard_metrics(df: pd.DataFrame, start_str: str, end_str: str):
         "spend_cat_values": spend_cat_values,
         "income_cat_labels": income_cat_labels,
         "income_cat_values": income_cat_values,
-    }
\ No newline at end of file
+    }
@@ -1,65 +1,128 @@
+import threading
+import time
+from functools import lru_cache, wraps
+
 import pandas as pd
-from db import run_query_df
-
-# Helper to normalize sign quirks for certain accounts (kept here so queries can call it)
-def normalize_transaction_signs(df: pd.DataFrame, account_id: str) -> pd.DataFrame:
-    df = df.copy()
-    apple_card_ids = ["cc_apple", "apple_card"]
-    if account_id and account_id.lower() in apple_card_ids:
-        df["AMOUNT"] = -df["AMOUNT"]
-    return df
+import pyarrow.compute as pc
+from db import run_query_arrow, run_query_df
 
-# Preload small summary datasets used by the UI charts (keeps behavior similar to original app)
-try:
-    cc_df = run_query_df(
-        "SELECT TRANSACTION_DATE, POST_DATE, DESCRIPTION, CATEGORY, TYPE, AMOUNT, MEMO, ACCOUNT_ID FROM FIN.CC_TRANSACTIONS"
-    )
-except Exception:
-    cc_df = pd.DataFrame(columns=["TRANSACTION_DATE", "POST_DATE", "DESCRIPTION", "CATEGORY", "TYPE", "AMOUNT", "MEMO", "ACCOUNT_ID"])
+# Dashboard queries are cached briefly so repeated renders with the same
+# filters reuse one Snowflake round trip
+QUERY_CACHE_TTL_SECONDS = 30
+QUERY_CACHE_MAX_ENTRIES = 64
+
+_query_cache: dict[tuple, tuple[float, pd.DataFrame]] = {}
+_query_cache_lock = threading.Lock()
+
+
+def ttl_cached(fn):
+    """Cache a query helper's DataFrame per argument tuple for QUERY_CACHE_TTL_SECONDS."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with _query_cache_lock:
+            hit = _query_cache.get(key)
+        if hit is not None and hit[0] > now:
+            # Callers add columns in place, so never hand out the cached frame
+            return hit[1].copy()
+
+        df = fn(*args, **kwargs)
+        with _query_cache_lock:
+            if len(_query_cache) >= QUERY_CACHE_MAX_ENTRIES:
+                for k in [k for k, (expires, _) in _query_cache.items() if expires <= now]:
+                    del _query_cache[k]
+                if len(_query_cache) >= QUERY_CACHE_MAX_ENTRIES:
+                    del _query_cache[next(iter(_query_cache))]
+            _query_cache[key] = (now + QUERY_CACHE_TTL_SECONDS, df)
+        return df.copy()
+
+    return wrapper
 
-try:
-    bank_df = run_query_df(
-        "SELECT POSTED_DATE, EFFECTIVE_DATE, DESCRIPTION, TRANSACTION_TYPE, AMOUNT, RUNNING_BALANCE FROM FIN.BANK_TRANSACTIONS"
+
+def clear_query_cache() -> None:
+    """Drop all cached query results, e.g. after new transactions are imported."""
+    with _query_cache_lock:
+        _query_cache.clear()
+    _load_cc_category_summary.cache_clear()
+    _load_bank_income_expense.cache_clear()
+
+
+# Accounts whose amounts are stored with the opposite sign convention
+APPLE_CARD_ACCOUNT_IDS = ("cc_apple", "apple_card")
+_APPLE_CARD_IDS_SQL = ", ".join(f"'{account_id}'" for account_id in APPLE_CARD_ACCOUNT_IDS)
+# Card AMOUNT with the Apple Card sign flipped per row
+_CC_SIGNED_AMOUNT_SQL = f"IFF(LOWER(ACCOUNT_ID) IN ({_APPLE_CARD_IDS_SQL}), -AMOUNT, AMOUNT)"
+
+
+# Overview chart data. These scan the full tables, so they are loaded on
+# first use rather than at import and kept until clear_query_cache(). The
+# results are a handful of values, read straight from Arrow without pandas.
+@lru_cache(maxsize=1)
+def _load_cc_category_summary() -> tuple[list, list]:
+    # Top 10 card spending categories, aggregated in Snowflake
+    cc_cat = run_query_arrow(
+        """
+        SELECT CATEGORY, SUM(ABS(AMOUNT)) AS AMOUNT_ABS
+        FROM FIN.CC_TRANSACTIONS
+        WHERE AMOUNT < 0
+        GROUP BY CATEGORY
+        ORDER BY AMOUNT_ABS DESC
+        LIMIT 10
+        """
     )
-except Exception:
-    bank_df = pd.DataFrame(columns=["POSTED_DATE", "EFFECTIVE_DATE", "DESCRIPTION", "TRANSACTION_TYPE", "AMOUNT", "RUNNING_BALANCE"])
-
-# Build cc category aggregates (top 10) used by charts as in original
-if not cc_df.empty:
-    cc_df["TRANSACTION_DATE"] = pd.to_datetime(cc_df["TRANSACTION_DATE"])
-    cc_spend = cc_df[cc_df["AMOUNT"] < 0].copy()
-    cc_spend["AMOUNT_ABS"] = cc_spend["AMOUNT"].abs()
-    cc_cat = (
-        cc_spend.groupby("CATEGORY", dropna=False)["AMOUNT_ABS"].sum().sort_values(ascending=False).reset_index()
+    if not cc_cat.num_rows:
+        return [], []
+    cc_cat = cc_cat.rename_columns([c.upper() for c in cc_cat.column_names])
+    return (
+        pc.fill_null(cc_cat["CATEGORY"], "Uncategorized").to_pylist(),
+        [float(v) for v in cc_cat["AMOUNT_ABS"].to_pylist()],
     )
-    cc_cat_top = cc_cat.head(10)
-    cc_category_labels = cc_cat_top["CATEGORY"].fillna("Uncategorized").tolist()
-    cc_category_values = cc_cat_top["AMOUNT_ABS"].tolist()
-else:
-    cc_category_labels = []
-    cc_category_values = []
 
-# Bank income/expense summary
-if not bank_df.empty:
-    bank_income = bank_df[bank_df["AMOUNT"] > 0]["AMOUNT"].sum()
-    bank_expense = bank_df[bank_df["AMOUNT"] < 0]["AMOUNT"].abs().sum()
-else:
-    bank_income = 0.0
-    bank_expense = 0.0
 
-bank_income_expense_labels = ["Income", "Expenses"]
-bank_income_expense_values = [float(bank_income), float(bank_expense)]
+@lru_cache(maxsize=1)
+def _load_bank_income_expense() -> tuple[list, list]:
+    totals = run_query_arrow(
+        """
+        SELECT
+          COALESCE(SUM(IFF(AMOUNT > 0, AMOUNT, 0)), 0) AS INCOME,
+          COALESCE(SUM(IFF(AMOUNT < 0, -AMOUNT, 0)), 0) AS EXPENSE
+        FROM FIN.BANK_TRANSACTIONS
+        """
+    )
+    if not totals.num_rows:
+        bank_income = 0.0
+        bank_expense = 0.0
+    else:
+        bank_income, bank_expense = totals.column(0)[0].as_py(), totals.column(1)[0].as_py()
+    return ["Income", "Expenses"], [float(bank_income), float(bank_expense)]
 
 
-def query_cc_transactions_snowflake(
+def get_cc_category_summary() -> tuple[list, list]:
+    """(labels, values) of the top 10 card spending categories."""
+    try:
+        return _load_cc_category_summary()
+    except Exception:
+        # Not cached, so the next render retries
+        return [], []
+
+
+def get_bank_income_expense() -> tuple[list, list]:
+    """(labels, values) of total bank income vs expenses."""
+    try:
+        return _load_bank_income_expense()
+    except Exception:
+        return ["Income", "Expenses"], [0.0, 0.0]
+
+
+def _cc_where(
     start_date: str,
     end_date: str,
     desc_filter: str | None,
     category_filter: str | None,
     amount_min: float | None,
     amount_max: float | None,
-    limit: int = 2000,
-) -> pd.DataFrame:
+) -> tuple[str, dict[str, object]]:
     where_clauses = ["TRANSACTION_DATE BETWEEN %(start)s AND %(end)s"]
     params: dict[str, object] = {"start": start_date, "end": end_date}
 
@@ -79,7 +142,47 @@ def query_cc_transactions_snowflake(
         where_clauses.append("AMOUNT <= %(amax)s")
         params["amax"] = amount_max
 
-    where_sql = " AND ".join(where_clauses)
+    return " AND ".join(where_clauses), params
+
+
+def _bank_where(
+    start_date: str,
+    end_date: str,
+    desc_filter: str | None,
+    amount_min: float | None,
+    amount_max: float | None,
+) -> tuple[str, dict[str, object]]:
+    where_clauses = ["POSTED_DATE BETWEEN %(start)s AND %(end)s"]
+    params: dict[str, object] = {"start": start_date, "end": end_date}
+
+    if desc_filter:
+        where_clauses.append("UPPER(DESCRIPTION) LIKE %(desc)s")
+        params["desc"] = f"%{desc_filter.upper()}%"
+
+    if amount_min is not None:
+        where_clauses.append("AMOUNT >= %(amin)s")
+        params["amin"] = amount_min
+
+    if amount_max is not None:
+        where_clauses.append("AMOUNT <= %(amax)s")
+        params["amax"] = amount_max
+
+    return " AND ".join(where_clauses), params
+
+
+@ttl_cached
+def query_cc_transactions_snowflake(
+    start_date: str,
+    end_date: str,
+    desc_filter: str | None,
+    category_filter: str | None,
+    amount_min: float | None,
+    amount_max: float | None,
+    limit: int = 2000,
+) -> pd.DataFrame:
+    where_sql, params = _cc_where(
+        start_date, end_date, desc_filter, category_filter, amount_min, amount_max
+    )
 
     sql = f"""
         SELECT
@@ -88,7 +191,7 @@ def query_cc_transactions_snowflake(
           DESCRIPTION,
           CATEGORY,
           TYPE,
-          AMOUNT,
+          {_CC_SIGNED_AMOUNT_SQL} AS AMOUNT,
           MEMO,
           ACCOUNT_ID
         FROM FIN.CC_TRANSACTIONS
@@ -102,14 +205,10 @@ def query_cc_transactions_snowflake(
         return df
 
     df.columns = [c.upper() for c in df.columns]
-
-    if "ACCOUNT_ID" in df.columns and len(df) > 0:
-        account_id = df["ACCOUNT_ID"].iloc[0]
-        df = normalize_transaction_signs(df, account_id)
-
     return df
 
 
+@ttl_cached
 def query_bank_transactions_snowflake(
     start_date: str,
     end_date: str,
@@ -119,22 +218,7 @@ def query_bank_transactions_snowflake(
     amount_max: float | None,
     limit: int = 2000,
 ) -> pd.DataFrame:
-    where_clauses = ["POSTED_DATE BETWEEN %(start)s AND %(end)s"]
-    params: dict[str, object] = {"start": start_date, "end": end_date}
-
-    if desc_filter:
-        where_clauses.append("UPPER(DESCRIPTION) LIKE %(desc)s")
-        params["desc"] = f"%{desc_filter.upper()}%"
-
-    if amount_min is not None:
-        where_clauses.append("AMOUNT >= %(amin)s")
-        params["amin"] = amount_min
-
-    if amount_max is not None:
-        where_clauses.append("AMOUNT <= %(amax)s")
-        params["amax"] = amount_max
-
-    where_sql = " AND ".join(where_clauses)
+    where_sql, params = _bank_where(start_date, end_date, desc_filter, amount_min, amount_max)
 
     sql = f"""
         SELECT
@@ -198,4 +282,80 @@ def query_bank_transactions_snowflake(
         "CHECK_NUMBER",
     ]
     df = df[cols]
-    return df
\ No newline at end of file
+    return df
+
+
+# ---------------------------------------------------
+# Dashboard summaries (aggregated in Snowflake)
+# ---------------------------------------------------
+
+SUMMARY_COLUMNS = ["TRANSACTION_DATE", "CATEGORY", "NUM_TX", "SPENT", "RECEIVED"]
+
+# Per (day, category) rollup of a filtered transaction set; the dashboard
+# cards and charts only need these sums, not the individual rows
+_SUMMARY_SQL = """
+    SELECT
+      TRANSACTION_DATE,
+      CATEGORY,
+      COUNT(*) AS NUM_TX,
+      SUM(IFF(AMOUNT < 0, AMOUNT, 0)) AS SPENT,
+      SUM(IFF(AMOUNT > 0, AMOUNT, 0)) AS RECEIVED
+    FROM ({source}) AS tx
+    GROUP BY TRANSACTION_DATE, CATEGORY
+"""
+
+
+def _run_summary(source_sql: str, params: dict[str, object]) -> pd.DataFrame:
+    df = run_query_df(_SUMMARY_SQL.format(source=source_sql), params)
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    df.columns = [c.upper() for c in df.columns]
+    df["SPENT"] = df["SPENT"].astype(float)
+    df["RECEIVED"] = df["RECEIVED"].astype(float)
+    return df[SUMMARY_COLUMNS]
+
+
+@ttl_cached
+def query_cc_summary_snowflake(
+    start_date: str,
+    end_date: str,
+    desc_filter: str | None,
+    category_filter: str | None,
+    amount_min: float | None,
+    amount_max: float | None,
+) -> pd.DataFrame:
+    """Daily/category totals for the same filters as query_cc_transactions_snowflake."""
+    where_sql, params = _cc_where(
+        start_date, end_date, desc_filter, category_filter, amount_min, amount_max
+    )
+    source_sql = f"""
+        SELECT
+          TRANSACTION_DATE,
+          CATEGORY,
+          {_CC_SIGNED_AMOUNT_SQL} AS AMOUNT
+        FROM FIN.CC_TRANSACTIONS
+        WHERE {where_sql}
+    """
+    return _run_summary(source_sql, params)
+
+
+@ttl_cached
+def query_bank_summary_snowflake(
+    start_date: str,
+    end_date: str,
+    desc_filter: str | None,
+    _category_filter: str | None,
+    amount_min: float | None,
+    amount_max: float | None,
+) -> pd.DataFrame:
+    """Daily/type totals for the same filters as query_bank_transactions_snowflake."""
+    where_sql, params = _bank_where(start_date, end_date, desc_filter, amount_min, amount_max)
+    source_sql = f"""
+        SELECT
+          COALESCE(EFFECTIVE_DATE, POSTED_DATE) AS TRANSACTION_DATE,
+          TRANSACTION_TYPE AS CATEGORY,
+          AMOUNT
+        FROM FIN.BANK_TRANSACTIONS
+        WHERE {where_sql}
+    """
+    return _run_summary(source_sql, params)
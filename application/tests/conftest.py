@@ -0,0 +1,9 @@
+"""
+Pytest configuration for the application tests.
+"""
+import sys
+from pathlib import Path
+
+# The application modules import each other by bare name (from db import ...),
+# as when run from the application directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
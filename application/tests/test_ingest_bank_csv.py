@@ -0,0 +1,60 @@
+"""
+Tests for streaming bank CSV parsing.
+"""
+import io
+
+import pandas as pd
+
+from ingest_bank_transactions import iter_prepared_chunks
+
+
+HEADER = "Posted Date,Effective Date,Transaction,Amount,Balance,Description,Check#,Memo"
+
+
+def read_prepared(text: str) -> pd.DataFrame:
+    """Run CSV text through the streaming parser and prepare step."""
+    return pd.concat(
+        list(iter_prepared_chunks(io.BytesIO(text.encode()), account_id="chk_main")),
+        ignore_index=True,
+    )
+
+
+def test_trailing_comma_header_is_parsed():
+    """A header ending in a comma adds an empty, unnamed column that is ignored."""
+    df = read_prepared(
+        HEADER + ",\n"
+        "01/02/2024,01/02/2024,DEBIT,-5.00,100.00,Coffee,,card,\n"
+    )
+
+    assert len(df) == 1
+    assert df.loc[0, "DESCRIPTION"] == "Coffee"
+    assert df.loc[0, "AMOUNT"] == -5.0
+    assert df.loc[0, "MEMO"] == "card"
+
+
+def test_short_row_is_padded():
+    """Rows that drop empty trailing fields load with those fields missing."""
+    df = read_prepared(
+        HEADER + "\n"
+        "01/02/2024,01/02/2024,DEBIT,-5.00,100.00,Coffee,,card\n"
+        "01/03/2024,01/03/2024,CREDIT,10.00,110.00,Payroll\n"
+    )
+
+    assert len(df) == 2
+    payroll = df[df["DESCRIPTION"] == "Payroll"].iloc[0]
+    assert payroll["AMOUNT"] == 10.0
+    assert pd.isna(payroll["CHECK_NUMBER"])
+    assert pd.isna(payroll["MEMO"])
+
+
+def test_long_row_extra_fields_are_dropped():
+    """Fields past the header are ignored, as csv.DictReader did."""
+    df = read_prepared(
+        HEADER + "\n"
+        '01/04/2024,01/04/2024,DEBIT,"-1,000.00",90.00,"Rent, Jan",101,memo,extra\n'
+    )
+
+    assert len(df) == 1
+    assert df.loc[0, "AMOUNT"] == -1000.0
+    assert df.loc[0, "DESCRIPTION"] == "Rent, Jan"
+    assert df.loc[0, "MEMO"] == "memo"
@@ -0,0 +1,56 @@
+"""
+Tests for streaming credit card CSV parsing.
+"""
+import io
+
+import pandas as pd
+
+from ingest_cc_transactions import iter_prepared_chunks
+
+
+def read_prepared(text: str) -> pd.DataFrame:
+    """Run CSV text through the streaming parser and prepare step."""
+    return pd.concat(
+        list(iter_prepared_chunks(io.BytesIO(text.encode()), account_id="cc_amex")),
+        ignore_index=True,
+    )
+
+
+def test_trailing_comma_header_is_parsed():
+    """A header ending in a comma adds an empty, unnamed column that is ignored."""
+    df = read_prepared(
+        "Date,Description,Amount,\n"
+        "01/02/2024,Coffee,5.00,\n"
+    )
+
+    assert len(df) == 1
+    assert df.loc[0, "DESCRIPTION"] == "Coffee"
+    assert df.loc[0, "AMOUNT"] == -5.0
+    assert df.loc[0, "TYPE"] == "CHARGE"
+
+
+def test_short_row_is_padded():
+    """Rows that drop empty trailing fields load with those fields missing."""
+    df = read_prepared(
+        "Date,Description,Amount,Category\n"
+        "01/02/2024,Coffee,5.00,Dining\n"
+        "01/03/2024,Payment,-100.00\n"
+    )
+
+    assert len(df) == 2
+    payment = df[df["DESCRIPTION"] == "Payment"].iloc[0]
+    assert payment["AMOUNT"] == 100.0
+    assert payment["TYPE"] == "PAYMENT"
+    assert pd.isna(payment["CATEGORY"])
+
+
+def test_long_row_extra_fields_are_dropped():
+    """Fields past the header are ignored, as csv.DictReader did."""
+    df = read_prepared(
+        "Date,Description,Amount,Category\n"
+        '01/04/2024,"Shop, Main St",7.00,Retail,x,y\n'
+    )
+
+    assert len(df) == 1
+    assert df.loc[0, "DESCRIPTION"] == "Shop, Main St"
+    assert df.loc[0, "CATEGORY"] == "Retail"